@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+bench_candidates.py — Memory and serialization cost of candidate representations
+
+Compares, on synthetic candidates:
+    dict       the previous Candidate (a plain dataclass with a per-instance
+               __dict__), round-tripped through asdict + json.dumps
+    slots      the slotted Candidate with interned strings and the direct
+               field encoder used by the checkpoint code
+
+For each size it reports memory held by the loaded candidates (tracemalloc,
+measured in a separate pass so it doesn't skew timings), load time from a
+JSONL checkpoint, and the time to serialize every candidate back to JSONL.
+
+One run (Python 3.11):
+            n  variant      MB  B/cand  load s  dump s
+    1,000,000  dict       1849    1849   29.29   57.47
+    1,000,000  slots      1516    1516   23.61   14.54
+
+Usage:
+    python bench_candidates.py                      # 10k, 100k, 1M
+    python bench_candidates.py --sizes 10000,100000
+"""
+
+import argparse
+import gc
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from dataclasses import MISSING, asdict, field, fields, make_dataclass
+from pathlib import Path
+
+from seed_pipeline import (
+    Candidate,
+    _candidate_line,
+    _iter_candidates,
+)
+
+LegacyCandidate = make_dataclass(
+    "LegacyCandidate",
+    [
+        (f.name, f.type) if f.default is MISSING and f.default_factory is MISSING
+        else (f.name, f.type, field(default=f.default) if f.default_factory is MISSING
+              else field(default_factory=f.default_factory))
+        for f in fields(Candidate)
+    ],
+)
+
+PROFESSIONS = [f"profession_{i}" for i in range(40)]
+CATEGORIES = ["actor", "musician", "athlete", "youtuber", "tiktoker", "streamer", "model", "meme"]
+LICENSES = ["CC BY-SA 4.0", "CC BY-SA 3.0", "CC BY 4.0", "CC BY 2.0", "CC0"]
+
+
+def synthetic(i: int, rng: random.Random) -> Candidate:
+    name = f"Person {i} {rng.choice(['Smith', 'Lee', 'Garcia', 'Kim', 'Nguyen'])}"
+    return Candidate(
+        qid=f"Q{1000000 + i}",
+        name=name,
+        description=f"synthetic public figure number {i}",
+        profession=rng.choice(PROFESSIONS),
+        category=rng.choice(CATEGORIES),
+        aliases=[f"{name} alias {k}" for k in range(rng.randint(0, 3))],
+        birth_year=rng.choice([None, rng.randint(1960, 2006)]),
+        gender=rng.choice(["male", "female", ""]),
+        platform_handles={p: f"handle{i}{p[:2]}" for p in rng.sample(["tiktok", "youtube", "instagram"], rng.randint(0, 2))},
+        headshot_url=f"https://upload.wikimedia.org/wikipedia/commons/thumb/a/ab/Person_{i}.jpg/512px-Person_{i}.jpg",
+        headshot_filename=f"Person_{i}.jpg",
+        headshot_source="wikimedia_commons",
+        headshot_license=rng.choice(LICENSES),
+        headshot_attribution=f"Photographer {i % 997}",
+        headshot_width=rng.randint(256, 4000),
+        headshot_height=rng.randint(256, 4000),
+        source_urls=[f"https://www.wikidata.org/wiki/Q{1000000 + i}"],
+        last_verified_at="2026-01-01T00:00:00+00:00",
+        revision=str(2000000000 + i),
+    )
+
+
+def write_checkpoint(path: Path, n: int):
+    rng = random.Random(n)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(_candidate_line(synthetic(i, rng)))
+
+
+def load_legacy(path: Path) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [LegacyCandidate(**json.loads(line)) for line in f if line.strip()]
+
+
+def load_slots(path: Path) -> list:
+    return list(_iter_candidates(path))
+
+
+def dump_legacy(items) -> int:
+    return sum(len(json.dumps(asdict(c), ensure_ascii=False) + "\n") for c in items)
+
+
+def dump_slots(items) -> int:
+    return sum(len(_candidate_line(c)) for c in items)
+
+
+VARIANTS = {
+    "dict": (load_legacy, dump_legacy),
+    "slots": (load_slots, dump_slots),
+}
+
+
+def measure(path: Path, load, dump) -> tuple[float, float, float]:
+    """(MB held after load, load seconds, dump seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    items = load(path)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    gc.collect()
+
+    started = time.perf_counter()
+    items = load(path)
+    loaded = time.perf_counter() - started
+    started = time.perf_counter()
+    dump(items)
+    dumped = time.perf_counter() - started
+    return held / 1e6, loaded, dumped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark candidate representations")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="Comma-separated candidate counts (default 10k, 100k, 1M)")
+    args = parser.parse_args()
+
+    print(f"{'n':>9} {'variant':<9} {'MB':>9} {'B/cand':>7} {'load s':>8} {'dump s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (int(s) for s in args.sizes.split(",")):
+            path = Path(tmp) / f"candidates_{n}.jsonl"
+            write_checkpoint(path, n)
+            for variant, (load, dump) in VARIANTS.items():
+                mb, loaded, dumped = measure(path, load, dump)
+                print(f"{n:>9,} {variant:<9} {mb:>9.1f} {mb * 1e6 / n:>7.0f} {loaded:>8.2f} {dumped:>8.2f}")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
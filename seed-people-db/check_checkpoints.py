@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+check_checkpoints.py — Self-check that incomplete stages are never committed
+
+Runs discovery against a fake Wikidata endpoint in a throwaway checkpoint
+directory, once cleanly and once with one discovery chunk failing, both
+materialized and streamed, and checks which stages reach the manifest:
+    clean      raw and deduped are committed
+    failing    raw is not committed, and neither is deduped, which was
+               built on the incomplete raw output
+
+No network access is needed. Exits non-zero on the first failed check.
+
+Usage:
+    python check_checkpoints.py
+"""
+
+import json
+import re
+import tempfile
+from pathlib import Path
+
+import requests
+
+import seed_pipeline as sp
+
+FAILING_OCCUPATION = "Q3665646"  # basketball player
+
+
+class FakeResponse:
+    def __init__(self, body: dict):
+        self.status_code = 200
+        self.headers = {}
+        self.text = json.dumps(body)
+        self._body = body
+
+    def json(self) -> dict:
+        return self._body
+
+    def raise_for_status(self):
+        pass
+
+
+def fake_sparql(fail: bool):
+    """A stand-in for HTTP_CACHE.get answering every discovery chunk."""
+    def get(url, params=None, headers=None, timeout=None, session=None):
+        query = params["query"]
+        if fail and FAILING_OCCUPATION in query:
+            raise requests.ConnectionError("connection reset by peer")
+        chunk = "-".join(re.findall(r"wd:(Q\d+)", query))
+        limit = int(re.search(r"LIMIT (\d+)", query).group(1))
+        rows = [
+            {
+                "person": {"value": f"http://www.wikidata.org/entity/Q{abs(hash((chunk, i))) % 10**9}"},
+                "personLabel": {"value": f"Person {chunk} {i}"},
+            }
+            for i in range(min(limit, 20))
+        ]
+        return FakeResponse({"results": {"bindings": rows}})
+    return get
+
+
+def committed(fail: bool, stream: bool) -> set[str]:
+    """Run discovery and dedup in a fresh checkpoint directory; return the committed stages."""
+    sp.CHECKPOINTS = sp.CheckpointManager(Path(tempfile.mkdtemp()))
+    sp.HTTP_CACHE.get = fake_sparql(fail)
+    if stream:
+        failures: list[str] = []
+        raw = sp.CHECKPOINTS.stream(
+            "raw", sp.discovery_config(), None,
+            lambda: sp.iter_discovered(failed=failures),
+            complete=lambda: not failures,
+        )
+        deduped = sp.CHECKPOINTS.stream(
+            "deduped", {**sp.DEDUP_CONFIG, "streaming": True}, "raw",
+            lambda: sp.iter_deduped(raw),
+        )
+        for _ in deduped:
+            pass
+    else:
+        sp.deduplicate(sp.discover_candidates())
+    return set(sp.CHECKPOINTS.manifest)
+
+
+def main():
+    sp.time.sleep = lambda seconds: None  # skip retry backoff
+    for stream in (False, True):
+        mode = "streamed" if stream else "materialized"
+        clean = committed(fail=False, stream=stream)
+        assert clean == {"raw", "deduped"}, f"{mode}, clean run committed {sorted(clean)}"
+        failing = committed(fail=True, stream=stream)
+        assert not failing, f"{mode}, failing chunk still committed {sorted(failing)}"
+        print(f"ok: {mode} discovery commits only complete stages")
+
+
+if __name__ == "__main__":
+    main()
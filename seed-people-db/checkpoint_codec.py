@@ -0,0 +1,213 @@
+"""
+checkpoint_codec.py — Pluggable on-disk formats for stage checkpoints
+
+Stage checkpoints used to be JSONL only: readable, but every restart paid
+for `json.loads` on every line. A codec turns a stream of rows (one value per
+field, in a fixed field order) into a file and back:
+
+    jsonl    one JSON object per line, as before; always available
+    msgpack  length-prefixed blocks of msgpack-encoded rows behind a small
+             header naming the fields. Blocks are zstd-compressed when the
+             `zstandard` package is installed. Reads memory-map the file
+             and decode one block at a time.
+
+`read` yields dicts keyed by field name, so a checkpoint written before a
+field was added still loads (the missing field takes its default). The
+msgpack codec also has `read_rows`, which hands back the stored field order
+and a RowReader over the raw rows, so callers whose fields match can skip
+building dicts. The reader unmaps the file once exhausted or closed.
+
+Needs `msgpack` for the binary codec and, optionally, `zstandard`
+(`pip install msgpack zstandard`). Convert a binary checkpoint back to
+JSONL with:
+
+    python checkpoint_codec.py _intermediate/candidates_deduped.ckpt > deduped.jsonl
+"""
+
+import importlib.util
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+MAGIC = b"SPCK\x01"
+BLOCK_ROWS = 2048
+ZSTD_LEVEL = 3
+_LENGTH = struct.Struct("<I")
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+class JsonlCodec:
+    name = "jsonl"
+    suffix = ".jsonl"
+
+    def open_writer(self, path: Path, fields: Sequence[str]) -> "JsonlWriter":
+        return JsonlWriter(path, fields)
+
+    def read(self, path: Path) -> Iterator[dict]:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class JsonlWriter:
+    def __init__(self, path: Path, fields: Sequence[str]):
+        self.fields = tuple(fields)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, values: Sequence, line: Optional[str] = None):
+        """Write one row; `line` is its JSON line when the caller already has it."""
+        self._file.write(line or _JSON_ENCODER.encode(dict(zip(self.fields, values))) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class MsgpackCodec:
+    name = "msgpack"
+    suffix = ".ckpt"
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise RuntimeError("The msgpack checkpoint codec needs msgpack: pip install msgpack") from e
+        self._msgpack = msgpack
+
+    def open_writer(self, path: Path, fields: Sequence[str]) -> "MsgpackWriter":
+        return MsgpackWriter(path, fields, self._msgpack, _zstd())
+
+    def read(self, path: Path) -> Iterator[dict]:
+        fields, rows = self.read_rows(path)
+        for row in rows:
+            yield dict(zip(fields, row))
+
+    def read_rows(self, path: Path) -> tuple[list[str], "RowReader"]:
+        """The checkpoint's field names, and a reader over its rows as lists."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if mm[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a msgpack checkpoint")
+            header, pos = _block(mm, len(MAGIC))
+            header = self._msgpack.unpackb(header)
+            decompress = None
+            if header.get("compression") == "zstd":
+                zstd = _zstd()
+                if zstd is None:
+                    raise RuntimeError(f"{path} is zstd-compressed: pip install zstandard")
+                decompress = zstd.ZstdDecompressor().decompress
+        except BaseException:
+            mm.close()
+            raise
+        return header["fields"], RowReader(mm, pos, self._msgpack.unpackb, decompress)
+
+
+class RowReader:
+    """Rows of a mapped msgpack checkpoint, decoded one block at a time.
+
+    Iterate it once; the mapping is released when iteration ends or on
+    `close`, which is safe to call before iterating or more than once.
+    """
+
+    def __init__(self, mm: mmap.mmap, pos: int, unpackb, decompress):
+        self._mm = mm
+        self._pos = pos
+        self._unpackb = unpackb
+        self._decompress = decompress
+
+    def __iter__(self) -> Iterator[list]:
+        mm, pos, unpackb, decompress = self._mm, self._pos, self._unpackb, self._decompress
+        try:
+            while pos < len(mm):
+                payload, pos = _block(mm, pos)
+                yield from unpackb(decompress(payload) if decompress else payload)
+        finally:
+            mm.close()
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self) -> "RowReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MsgpackWriter:
+    def __init__(self, path: Path, fields: Sequence[str], msgpack, zstd):
+        self._packb = msgpack.packb
+        self._compress = zstd.ZstdCompressor(level=ZSTD_LEVEL).compress if zstd else None
+        self._rows: list = []
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._write_block(self._packb({
+            "fields": list(fields),
+            "compression": "zstd" if zstd else None,
+        }))
+
+    def write(self, values: Sequence, line: Optional[str] = None):
+        self._rows.append(values)
+        if len(self._rows) >= BLOCK_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        payload = self._packb(self._rows)
+        self._rows = []
+        self._write_block(self._compress(payload) if self._compress else payload)
+
+    def _write_block(self, payload: bytes):
+        self._file.write(_LENGTH.pack(len(payload)))
+        self._file.write(payload)
+
+    def close(self):
+        self._flush()
+        self._file.close()
+
+
+def _block(mm: mmap.mmap, pos: int) -> tuple[bytes, int]:
+    (length,) = _LENGTH.unpack_from(mm, pos)
+    start = pos + _LENGTH.size
+    return mm[start:start + length], start + length
+
+
+def _zstd():
+    if importlib.util.find_spec("zstandard") is None:
+        return None
+    import zstandard
+    return zstandard
+
+
+CODECS = {"jsonl": JsonlCodec, "msgpack": MsgpackCodec}
+
+
+def available_codecs() -> list[str]:
+    return ["jsonl"] + (["msgpack"] if importlib.util.find_spec("msgpack") else [])
+
+
+def get_codec(name: str):
+    """Codec instance by name; raises RuntimeError when its dependency is missing."""
+    if name not in CODECS:
+        raise ValueError(f"unknown checkpoint codec {name!r} (choose from {', '.join(CODECS)})")
+    return CODECS[name]()
+
+
+def codec_for(path: Path):
+    """The codec that reads `path`, picked by its file suffix."""
+    for cls in CODECS.values():
+        if Path(path).suffix == cls.suffix:
+            return cls()
+    raise ValueError(f"no checkpoint codec reads {path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python checkpoint_codec.py CHECKPOINT > out.jsonl")
+    for record in codec_for(Path(sys.argv[1])).read(Path(sys.argv[1])):
+        sys.stdout.write(_JSON_ENCODER.encode(record) + "\n")
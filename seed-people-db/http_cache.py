@@ -0,0 +1,216 @@
+"""
+http_cache.py — Persistent on-disk HTTP response cache
+
+A small SQLite-backed cache for the GET requests made by the seed scripts
+(Wikidata SPARQL, Commons imageinfo, Wikipedia page summaries). Entries are
+keyed by a hash of the URL and its query params, expire after a per-endpoint
+TTL, are revalidated with ETag / Last-Modified when stale, and are evicted
+least-recently-used first once the cache grows past its size cap.
+
+Usage:
+    cache = HttpCache(Path("_cache/http_cache.sqlite"), ttls={...})
+    resp = cache.get(url, params=params, headers=headers, timeout=30)
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+log = logging.getLogger("http_cache")
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    status        INTEGER NOT NULL,
+    headers       TEXT NOT NULL,
+    body          BLOB NOT NULL,
+    size          INTEGER NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    stored_at     REAL NOT NULL,
+    accessed_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+"""
+
+
+def cache_key(url: str, params: Optional[dict] = None) -> str:
+    """Content-address a request by URL plus a hash of its sorted params."""
+    encoded = urllib.parse.urlencode(sorted((params or {}).items()), doseq=True)
+    return hashlib.sha256(f"GET {url}?{encoded}".encode("utf-8")).hexdigest()
+
+
+class HttpCache:
+    """SQLite response cache with per-endpoint TTLs and LRU eviction.
+
+    `ttls` maps a URL prefix to a TTL in seconds; the longest matching
+    prefix wins. Only 200 responses are stored — errors and rate-limit
+    responses are always passed straight through to the caller.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttls: Optional[dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        enabled: bool = True,
+    ):
+        self.path = Path(path)
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+
+    def _db(self) -> sqlite3.Connection:
+        """Open the database lazily so importing a script never touches disk."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            self._total_bytes = row[0]
+        return self._conn
+
+    def ttl_for(self, url: str) -> float:
+        matches = [p for p in self.ttls if url.startswith(p)]
+        if not matches:
+            return self.default_ttl
+        return self.ttls[max(matches, key=len)]
+
+    def get(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: float = 30,
+        session: Optional[requests.Session] = None,
+    ) -> requests.Response:
+        """GET `url`, serving from the cache when fresh and revalidating when stale."""
+        http = session or requests
+        if not self.enabled:
+            return http.get(url, params=params, headers=headers, timeout=timeout)
+
+        key = cache_key(url, params)
+        with self._lock:
+            row = self._db().execute(
+                "SELECT status, headers, body, etag, last_modified, stored_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+        now = time.time()
+        if row and now - row[5] < self.ttl_for(url):
+            self.hits += 1
+            self._touch(key, now)
+            return _build_response(url, row[0], row[1], row[2])
+
+        request_headers = dict(headers or {})
+        if row and row[3]:
+            request_headers["If-None-Match"] = row[3]
+        if row and row[4]:
+            request_headers["If-Modified-Since"] = row[4]
+
+        resp = http.get(url, params=params, headers=request_headers, timeout=timeout)
+
+        if resp.status_code == 304 and row:
+            self.revalidated += 1
+            with self._lock:
+                self._db().execute(
+                    "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                    (now, now, key),
+                )
+            return _build_response(url, row[0], row[1], row[2])
+
+        self.misses += 1
+        if resp.status_code == 200:
+            self._store(key, url, resp, now)
+        return resp
+
+    def _touch(self, key: str, now: float):
+        with self._lock:
+            self._db().execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+
+    def _store(self, key: str, url: str, resp: requests.Response, now: float):
+        body = resp.content
+        stored_headers = {
+            k: v for k, v in resp.headers.items()
+            if k.lower() in ("content-type", "etag", "last-modified")
+        }
+        with self._lock:
+            db = self._db()
+            old = db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, status, headers, body, size, etag, last_modified, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, url, resp.status_code, json.dumps(stored_headers), body,
+                    len(body), resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"), now, now,
+                ),
+            )
+            self._total_bytes += len(body) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection):
+        """Drop least-recently-used entries until the cache is under 90% of its cap."""
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for key, size in db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            if self._total_bytes <= target:
+                break
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= size
+            evicted += 1
+        log.debug(f"HTTP cache evicted {evicted} entries ({self._total_bytes} bytes kept)")
+
+    def stats(self) -> str:
+        return (
+            f"{self.hits} hits, {self.revalidated} revalidated, "
+            f"{self.misses} misses ({self._total_bytes / 1e6:.1f} MB on disk)"
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _build_response(url: str, status: int, headers: str, body: bytes) -> requests.Response:
+    """Rehydrate a stored entry as a requests.Response so callers are unchanged."""
+    resp = requests.Response()
+    resp.status_code = status
+    resp.url = url
+    resp.headers = CaseInsensitiveDict(json.loads(headers))
+    resp._content = body
+    resp.encoding = "utf-8"
+    return resp
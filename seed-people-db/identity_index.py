@@ -0,0 +1,294 @@
+"""
+identity_index.py — Shared identity index for everything that writes `people`
+
+seed_pipeline (keyed by Wikidata QID), tiktok_scraper and import_influencers
+(random-suffix slugs) all insert people rows. Without a shared view the same
+creator lands in the table once per source. This module keeps one SQLite
+index, shared by all three, mapping each identity key of a person to their
+canonical people.id:
+
+    qid                                      Wikidata QID
+    tiktok, twitch, kick, instagram, youtube handle, lowercased, no "@"
+    name                                     folded name, spaces removed
+    slug                                     people.slug, lowercased
+
+Writers call `lookup(record)` before inserting and `add(record)` once they
+have. people.slug is unique, so a match on the slug alone means the slug
+is taken by someone else, not that the person exists: the writer picks a
+new slug and looks again. Rows added locally are filed under a provisional "local:<slug or qid>"
+id until a sync brings the real row back from the database. `sync` pulls
+rows changed since the last sync; `rebuild` reloads every row in one
+keyset-paginated pass and replaces the index in a single transaction.
+
+Usage:
+    index = IdentityIndex(supabase_url=SUPABASE_URL, supabase_key=SUPABASE_KEY)
+    index.sync()
+    if index.lookup(record) is None:
+        write(record)
+        index.add(record)
+
+    python identity_index.py --rebuild
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+import requests
+
+from entity_resolution import fold_name
+
+log = logging.getLogger("identity_index")
+
+DEFAULT_PATH = Path(__file__).parent / "_cache" / "identity_index.sqlite"
+PLATFORMS = ("tiktok", "twitch", "kick", "instagram", "youtube")
+PAGE_SIZE = 1000
+KEYS_VERSION = "2"  # bump when identity_keys changes; an older index is rebuilt on sync
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS identities (
+    kind        TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    person_id   TEXT NOT NULL,
+    PRIMARY KEY (kind, value)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_identities_person ON identities(person_id);
+CREATE TABLE IF NOT EXISTS meta (
+    name        TEXT PRIMARY KEY,
+    value       TEXT
+);
+"""
+_SELECT = ",".join(
+    ["id", "slug", "name", "wikidata_qid", "platform_handles", "updated_at"]
+    + [f"{p}_handle" for p in PLATFORMS]
+)
+
+
+@dataclass
+class Match:
+    person_id: str
+    kind: str
+    value: str
+
+    @property
+    def local(self) -> bool:
+        """True when the person was added by a writer and not yet synced back."""
+        return self.person_id.startswith("local:")
+
+
+def name_key(name: Optional[str]) -> Optional[str]:
+    return fold_name(name or "").replace(" ", "") or None
+
+
+def handle_key(handle) -> Optional[str]:
+    if not isinstance(handle, str):
+        return None
+    return handle.lower().strip().lstrip("@") or None
+
+
+def identity_keys(record: dict) -> list[tuple[str, str]]:
+    """(kind, value) pairs for a people row or an outgoing record, strongest first.
+
+    Handles come from the `<platform>_handle` columns or, failing that, from
+    string values in `platform_handles` (the seed pipeline stores handles
+    there, import_influencers stores follower counts, which are ignored, and
+    tiktok_scraper keeps the TikTok handle under `_handle`).
+    """
+    keys = []
+    if record.get("wikidata_qid"):
+        keys.append(("qid", record["wikidata_qid"]))
+    ph = record.get("platform_handles")
+    ph = ph if isinstance(ph, dict) else {}
+    for platform in PLATFORMS:
+        handle = handle_key(record.get(f"{platform}_handle")) or handle_key(ph.get(platform))
+        if platform == "tiktok":
+            handle = handle or handle_key(ph.get("_handle"))
+        if handle:
+            keys.append((platform, handle))
+    name = name_key(record.get("name"))
+    if name:
+        keys.append(("name", name))
+    if record.get("slug"):
+        keys.append(("slug", record["slug"].lower()))
+    return keys
+
+
+def local_id(record: dict) -> str:
+    return f"local:{record.get('slug') or record.get('wikidata_qid')}"
+
+
+class IdentityIndex:
+    """SQLite map of identity keys → canonical person id, shared by all writers.
+
+    The first person to claim a key keeps it. A name-only match is ignored
+    when both sides carry different QIDs, since two Wikidata items can share
+    a name. Safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_PATH,
+        supabase_url: Optional[str] = None,
+        supabase_key: Optional[str] = None,
+    ):
+        self.path = Path(path)
+        self.url = f"{supabase_url}/rest/v1/people" if supabase_url else None
+        self.headers = {"apikey": supabase_key or "", "Authorization": f"Bearer {supabase_key}"}
+        self.ready = False  # a sync or rebuild has succeeded in this process
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ── Lookups ──
+
+    def lookup(self, record: dict) -> Optional[Match]:
+        """The person `record` already exists as, matched on its strongest key."""
+        qid = record.get("wikidata_qid")
+        with self._lock:
+            for kind, value in identity_keys(record):
+                person_id = self._get(kind, value)
+                if person_id is None:
+                    continue
+                if kind == "name" and qid and self._has_qid(person_id):
+                    continue
+                return Match(person_id, kind, value)
+        return None
+
+    def lookup_key(self, kind: str, value: str) -> Optional[str]:
+        with self._lock:
+            return self._get(kind, value)
+
+    def _get(self, kind: str, value: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT person_id FROM identities WHERE kind = ? AND value = ?", (kind, value)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _has_qid(self, person_id: str) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM identities WHERE person_id = ? AND kind = 'qid' LIMIT 1", (person_id,)
+        ).fetchone() is not None
+
+    # ── Writes ──
+
+    def add(self, record: dict, person_id: Optional[str] = None) -> str:
+        """Claim `record`'s keys for `person_id` (a provisional local id by default)."""
+        person_id = person_id or local_id(record)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO identities VALUES (?, ?, ?)",
+                [(kind, value, person_id) for kind, value in identity_keys(record)],
+            )
+        return person_id
+
+    def _apply(self, rows: list[dict]):
+        """File database rows under their real ids, adopting any local placeholders."""
+        for r in rows:
+            person_id = str(r["id"])
+            placeholders = [f"local:{r[k]}" for k in ("slug", "wikidata_qid") if r.get(k)]
+            if placeholders:
+                marks = ", ".join("?" * len(placeholders))
+                self._conn.execute(
+                    f"UPDATE identities SET person_id = ? WHERE person_id IN ({marks})",
+                    (person_id, *placeholders),
+                )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO identities VALUES (?, ?, ?)",
+                [(kind, value, person_id) for kind, value in identity_keys(r)],
+            )
+        newest = max((r["updated_at"] for r in rows if r.get("updated_at")), default=None)
+        if newest and newest > (self._meta("synced_through") or ""):
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('synced_through', ?)", (newest,)
+            )
+
+    def _meta(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    # ── Database sync ──
+
+    def sync(self) -> int:
+        """Pull rows updated since the last sync; returns how many arrived."""
+        with self._lock:
+            since = self._meta("synced_through")
+            stale = self._meta("keys_version") != KEYS_VERSION
+        if since is None or stale:
+            return self.rebuild()
+        rows = list(self._fetch(since))
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._apply(rows)
+        self.ready = True
+        return len(rows)
+
+    def rebuild(self) -> int:
+        """Reload every people row in one pass and replace the index with it."""
+        rows = list(self._fetch())
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM identities")
+            self._conn.execute("DELETE FROM meta")
+            self._apply(rows)
+            self._conn.execute("INSERT INTO meta VALUES ('keys_version', ?)", (KEYS_VERSION,))
+        self.ready = True
+        log.info(f"Identity index rebuilt: {len(rows)} people, {len(self)} indexed")
+        return len(rows)
+
+    def _fetch(self, since: Optional[str] = None) -> Iterator[dict]:
+        """Page through people rows: all of them by id, or those updated at or after `since`."""
+        if not self.url:
+            raise RuntimeError("IdentityIndex needs supabase_url and supabase_key to sync")
+        last_id, offset = None, 0
+        while True:
+            params = {"select": _SELECT, "limit": PAGE_SIZE}
+            if since:
+                # updated_at is not unique, so delta syncs page by offset
+                params.update(order="updated_at.asc,id.asc", updated_at=f"gte.{since}", offset=offset)
+            else:
+                params["order"] = "id.asc"
+                if last_id:
+                    params["id"] = f"gt.{last_id}"
+            r = requests.get(self.url, headers=self.headers, params=params, timeout=30)
+            r.raise_for_status()
+            page = r.json()
+            yield from page
+            if len(page) < PAGE_SIZE:
+                return
+            last_id, offset = page[-1]["id"], offset + PAGE_SIZE
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(DISTINCT person_id) FROM identities"
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    parser = argparse.ArgumentParser(description="Sync the shared people identity index")
+    parser.add_argument(
+        "--rebuild", action="store_true",
+        help="Drop the index and reload every people row (default: delta sync)",
+    )
+    args = parser.parse_args()
+    index = IdentityIndex(
+        supabase_url=os.getenv("SUPABASE_URL"), supabase_key=os.getenv("SUPABASE_KEY")
+    )
+    n = index.rebuild() if args.rebuild else index.sync()
+    log.info(f"Identity index: {n} rows pulled, {len(index)} people indexed")
+    index.close()
@@ -2,12 +2,19 @@
 """
 Import top influencers from TikTok/Twitch/Kick into mogged.chat Supabase.
 Uses BATCH inserts for speed. Service role key bypasses RLS.
+Skips anyone already in the shared identity index (see identity_index.py).
 
 Usage:  python3 import_influencers.py
+        python3 import_influencers.py --copy   # COPY over DATABASE_URL instead of PostgREST
 """
 
 import os, re, sys, json, uuid, time, requests
 from collections import OrderedDict
+from pathlib import Path
+
+from http_cache import HttpCache
+from identity_index import IdentityIndex
+from pg_copy import CopyLoader
 
 # ─── Config ──────────────────────────────────────────────
 def load_env(path):
@@ -28,6 +35,7 @@ env_seed = load_env(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".e
 
 SUPABASE_URL = env_local.get("NEXT_PUBLIC_SUPABASE_URL") or env_seed.get("SUPABASE_URL") or "https://kjibzupnfpkxyynjtroj.supabase.co"
 SUPABASE_KEY = env_local.get("SUPABASE_SERVICE_ROLE_KEY") or env_seed.get("SUPABASE_KEY")
+DATABASE_URL = env_local.get("DATABASE_URL") or env_seed.get("DATABASE_URL") or os.environ.get("DATABASE_URL")
 if not SUPABASE_KEY:
     print("ERROR: No key found"); sys.exit(1)
 
@@ -43,6 +51,10 @@ SKIP = {"TikTok","Real Madrid C.F.","fcbarcelona","ESPN","Champions League","Net
         "WWE","Barstool Sports","XO TEAM","Riot Games","Fortnite","VALORANT","easportsfc",
         "RocketLeague","ESLCS","kingsleague"}
 
+WIKI_SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+HTTP_CACHE = HttpCache(Path(__file__).parent / "_cache" / "http_cache.sqlite",
+                       ttls={WIKI_SUMMARY_URL: 7*24*3600})
+
 # ═══════════════════════════════════════════════════════════
 TIKTOK = [
     (1,"Khabane lame",160400000),(2,"charli d'amelio",155800000),(3,"MrBeast",124600000),
@@ -195,8 +207,8 @@ def slug(n):
 
 def wiki_thumb(title):
     try:
-        r=requests.get(f"https://en.wikipedia.org/api/rest_v1/page/summary/{requests.utils.quote(title)}",
-                       timeout=10,headers={"User-Agent":"mogged/1.0"})
+        r=HTTP_CACHE.get(f"{WIKI_SUMMARY_URL}{requests.utils.quote(title)}",
+                         timeout=10,headers={"User-Agent":"mogged/1.0"})
         if r.ok:
             src=r.json().get("thumbnail",{}).get("source")
             if src: return re.sub(r'/(\d+)px-','/500px-',src)
@@ -255,6 +267,58 @@ def build():
     result.sort(key=lambda x:sum(x["platform_handles"].values()),reverse=True)
     return result
 
+def upload_rest(people,index):
+    # Batch insert (PostgREST supports array POST)
+    url=f"{SUPABASE_URL}/rest/v1/people"
+
+    # Split into batches of 50
+    batch_size=50
+    total_ok=0
+    total_err=0
+    for i in range(0,len(people),batch_size):
+        batch=people[i:i+batch_size]
+        try:
+            r=requests.post(url,headers=HEADERS,json=batch,timeout=60)
+            if r.status_code in (200,201):
+                rows=r.json()
+                total_ok+=len(rows)
+                for row in rows:
+                    index.add(row,str(row["id"]))
+                    ph=row.get("platform_handles",{})
+                    tot=sum(v for k,v in ph.items() if isinstance(v,(int,float)))
+                    print(f"    + {row['name']:<35s} {tot:>13,} followers")
+            else:
+                total_err+=len(batch)
+                print(f"    ! Batch {i//batch_size+1} ERROR {r.status_code}: {r.text[:200]}")
+        except Exception as e:
+            total_err+=len(batch)
+            print(f"    ! Batch {i//batch_size+1} EXCEPTION: {e}")
+    return total_ok,total_err
+
+def upload_copy(people,index):
+    # One COPY straight into people in a single transaction. Slugs carry a random
+    # suffix, so there is no stable key to merge on: reruns rely on drop_existing.
+    if not people: return 0,0
+    try: loader=CopyLoader(DATABASE_URL,"people",list(people[0].keys()))
+    except RuntimeError as e: sys.exit(f"  ! --copy: {e}")
+    for p in people: loader.add(p,key=p["slug"])
+    try: loader.close()
+    except RuntimeError as e: sys.exit(f"  ! --copy: {e}")  # rolled back, nothing was imported
+    for p in people:
+        if p["slug"] in loader.written: index.add(p)  # real ids arrive with the next sync
+    return loader.success_count,loader.error_count
+
+def drop_existing(people,index):
+    # Skip anyone the seed pipeline, the scraper or an earlier import already created
+    fresh=[]
+    for p in people:
+        m=index.lookup(p)
+        while m and m.kind=="slug":  # only the random slug suffix collided: roll a new one
+            p["slug"]=slug(p["name"]); m=index.lookup(p)
+        if m: print(f"    = {p['name']:<35s} already in people ({m.kind} match)")
+        else: fresh.append(p)
+    return fresh
+
 def main():
     print("="*60)
     print("  mogged.chat — Influencer Batch Import")
@@ -270,6 +334,7 @@ def main():
     for p in people:
         wt=WIKI.get(p["name"])
         if wt:
+            hits=HTTP_CACHE.hits
             thumb=wiki_thumb(wt)
             if thumb:
                 p["headshot_url"]=thumb
@@ -281,34 +346,28 @@ def main():
                 print(f"    + {p['name']}")
             else:
                 print(f"    - {p['name']}")
-            time.sleep(0.1)
-    print(f"  Got {hcount} headshots\n")
+            if HTTP_CACHE.hits==hits: time.sleep(0.1)  # only throttle real requests
+    print(f"  Got {hcount} headshots ({HTTP_CACHE.stats()})\n")
 
-    # Batch insert (PostgREST supports array POST)
-    print("  Uploading to Supabase (batch)...")
-    url=f"{SUPABASE_URL}/rest/v1/people"
-    
-    # Split into batches of 50
-    batch_size=50
-    total_ok=0
-    total_err=0
-    for i in range(0,len(people),batch_size):
-        batch=people[i:i+batch_size]
-        try:
-            r=requests.post(url,headers=HEADERS,json=batch,timeout=60)
-            if r.status_code in (200,201):
-                rows=r.json()
-                total_ok+=len(rows)
-                for row in rows:
-                    ph=row.get("platform_handles",{})
-                    tot=sum(v for k,v in ph.items() if isinstance(v,(int,float)))
-                    print(f"    + {row['name']:<35s} {tot:>13,} followers")
-            else:
-                total_err+=len(batch)
-                print(f"    ! Batch {i//batch_size+1} ERROR {r.status_code}: {r.text[:200]}")
-        except Exception as e:
-            total_err+=len(batch)
-            print(f"    ! Batch {i//batch_size+1} EXCEPTION: {e}")
+    print("  Checking identity index...")
+    index=IdentityIndex(supabase_url=SUPABASE_URL,supabase_key=SUPABASE_KEY)
+    try:
+        n=index.sync()
+        print(f"  {len(index)} people indexed ({n} synced)")
+    except Exception as e:
+        print(f"  ! Identity index sync failed, using the local copy: {e}")
+    fresh=drop_existing(people,index)
+    print(f"  {len(people)-len(fresh)} already exist, {len(fresh)} new\n")
+
+    try:
+        if "--copy" in sys.argv[1:]:
+            print("  Uploading to Supabase (COPY)...")
+            total_ok,total_err=upload_copy(fresh,index)
+        else:
+            print("  Uploading to Supabase (batch)...")
+            total_ok,total_err=upload_rest(fresh,index)
+    finally:
+        index.close()
 
     print(f"\n{'='*60}")
     print(f"  DONE: {total_ok} inserted, {total_err} errors, {hcount} headshots")
@@ -0,0 +1,142 @@
+"""
+pg_copy.py — COPY-based bulk loader for full reseeds
+
+PostgREST upserts top out at a few hundred rows per second even when
+batched. For full reseeds the seed scripts can instead stream rows over a
+direct Postgres connection with `COPY ... FROM STDIN` into a temporary
+staging table, then merge the whole stage into the target table with one
+`INSERT ... ON CONFLICT`. Everything happens in a single transaction, so a
+failed load leaves the table untouched.
+
+Needs psycopg 3 (`pip install "psycopg[binary]"`) and a direct connection
+string in DATABASE_URL (Supabase: Project Settings → Database → URI).
+
+Usage:
+    loader = CopyLoader(dsn, "people", columns, conflict_column="wikidata_qid")
+    for record in records:
+        loader.add(record, key=record["wikidata_qid"])
+    loader.close()
+"""
+
+import logging
+import time
+from contextlib import ExitStack
+from typing import Optional
+
+log = logging.getLogger("pg_copy")
+
+
+class CopyLoader:
+    """Stream dict rows into `table` with COPY; mirrors SupabaseBatchWriter.
+
+    With `conflict_column` set, rows are copied into a temporary staging
+    table and merged with `INSERT ... ON CONFLICT (conflict_column) DO
+    UPDATE`; the last row for a duplicated key wins. Without it, rows are
+    copied straight into `table`. Keys passed to `add` are collected in
+    `written` once the transaction commits.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        table: str,
+        columns: list[str],
+        conflict_column: Optional[str] = None,
+    ):
+        try:
+            import psycopg
+            from psycopg.types.json import Jsonb
+        except ImportError as e:
+            raise RuntimeError(
+                'The COPY loader needs psycopg 3: pip install "psycopg[binary]"'
+            ) from e
+        if not dsn:
+            raise RuntimeError("The COPY loader needs DATABASE_URL (a direct Postgres connection string)")
+
+        self.table = table
+        self.columns = list(columns)
+        self.conflict_column = conflict_column
+        self.success_count = 0
+        self.error_count = 0
+        self.written: set[str] = set()
+        self._jsonb = Jsonb
+        self._keys: list[str] = []
+        self._count = 0
+        self._started = time.monotonic()
+
+        self._conn = psycopg.connect(dsn)
+        self._stack = ExitStack()
+        cols = ", ".join(self.columns)
+        self._stage = table
+        try:
+            if conflict_column:
+                # Column types only — no NOT NULL or unique constraints to trip on
+                self._stage = f"_stage_{table}"
+                self._conn.execute(
+                    f"CREATE TEMP TABLE {self._stage} ON COMMIT DROP AS "
+                    f"SELECT {cols} FROM {table} WITH NO DATA"
+                )
+                self._conn.execute(f"ALTER TABLE {self._stage} ADD COLUMN _seq BIGSERIAL")
+            cur = self._stack.enter_context(self._conn.cursor())
+            self._copy = self._stack.enter_context(
+                cur.copy(f"COPY {self._stage} ({cols}) FROM STDIN")
+            )
+        except Exception:
+            self._conn.close()
+            raise
+
+    def add(self, record: dict, key: Optional[str] = None):
+        self._copy.write_row([self._adapt(record.get(c)) for c in self.columns])
+        self._count += 1
+        if key is not None:
+            self._keys.append(key)
+
+    def _adapt(self, value):
+        return self._jsonb(value) if isinstance(value, dict) else value
+
+    def close(self):
+        """Finish the COPY, merge the stage and commit.
+
+        On error the transaction is rolled back and RuntimeError is raised
+        once the connection is closed, like SupabaseBatchWriter.close, so
+        a failed load can't pass for an empty one.
+        """
+        failure = None
+        try:
+            self._stack.close()  # ends the COPY; the transaction stays open
+            self._merge()
+            self._conn.commit()
+        except Exception as e:
+            failure = e
+            self.error_count = self._count
+            log.error(f"{self.table} COPY load failed, nothing written: {e}")
+            try:
+                self._conn.rollback()
+            except Exception:
+                pass
+        else:
+            self.success_count = self._count
+            self.written.update(self._keys)
+        finally:
+            self._conn.close()
+        elapsed = time.monotonic() - self._started
+        log.info(
+            f"{self.table} COPY load: {self.success_count} success, "
+            f"{self.error_count} errors in {elapsed:.1f}s"
+        )
+        if failure is not None:
+            raise RuntimeError(f"{self.table} COPY load failed: {failure}") from failure
+
+    def _merge(self):
+        if not self.conflict_column:
+            return
+        cols = ", ".join(self.columns)
+        updates = ", ".join(
+            f"{c} = EXCLUDED.{c}" for c in self.columns if c != self.conflict_column
+        )
+        self._conn.execute(
+            f"INSERT INTO {self.table} ({cols}) "
+            f"SELECT DISTINCT ON ({self.conflict_column}) {cols} FROM {self._stage} "
+            f"ORDER BY {self.conflict_column}, _seq DESC "
+            f"ON CONFLICT ({self.conflict_column}) DO UPDATE SET {updates}"
+        )
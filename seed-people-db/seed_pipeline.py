@@ -9,33 +9,55 @@ applies safety filtering, deduplicates, and uploads to Supabase.
 Usage:
     1. Run schema.sql in your Supabase SQL Editor first.
     2. pip install -r requirements.txt
-    3. python seed_pipeline.py
+    3. python seed_pipeline.py [--concurrency N] [--rps R] [--no-cache]
+       python seed_pipeline.py --incremental   # nightly refresh of changed people
+       python seed_pipeline.py --stream        # bounded-memory generator pipeline
+       python seed_pipeline.py --loader copy   # full reseed over COPY (needs DATABASE_URL)
+       python seed_pipeline.py --checkpoint-format jsonl   # readable stage checkpoints
 """
 
+import argparse
 import csv
+import gc
 import hashlib
+import importlib.util
 import json
 import logging
 import os
+import random
 import re
 import sys
+import threading
 import time
 import urllib.parse
-from dataclasses import asdict, dataclass, field
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from operator import attrgetter
+from email.utils import parsedate_to_datetime
+from dataclasses import asdict, dataclass, field, fields, replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Union
 
 import requests
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+from entity_resolution import Entity, EntityIndex, resolution_config, resolve
+from checkpoint_codec import available_codecs, codec_for, get_codec
+from http_cache import HttpCache
+from identity_index import IdentityIndex
+from pg_copy import CopyLoader
+
 # ── Configuration ────────────────────────────────────────────────────
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+DATABASE_URL = os.getenv("DATABASE_URL")  # direct Postgres URI, only for --loader copy
 
 WIKIDATA_SPARQL_URL = "https://query.wikidata.org/sparql"
 COMMONS_API_URL = "https://commons.wikimedia.org/w/api.php"
@@ -45,13 +67,39 @@ USER_AGENT = "SeedPeopleDB/1.0 (mogged.chat seed pipeline; contact@mogged.chat)"
 BASE_DIR = Path(__file__).parent
 INTERMEDIATE_DIR = BASE_DIR / "_intermediate"
 OUTPUT_DIR = BASE_DIR / "output"
+CACHE_DIR = BASE_DIR / "_cache"
+STATE_DIR = BASE_DIR / "_state"  # snapshot of the last run, used by --incremental
 INTERMEDIATE_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 # Rate limiting (seconds between API calls)
-SPARQL_DELAY = 2.0
+SPARQL_CONCURRENCY = 3  # WDQS allows 5 concurrent queries per client
 COMMONS_API_DELAY = 0.3
-SUPABASE_BATCH_SIZE = 50
+COMMONS_CONCURRENCY = 8
+COMMONS_REQUESTS_PER_SECOND = 10.0
+COMMONS_TITLES_PER_REQUEST = 50  # MediaWiki API limit for non-bot clients
+COMMONS_THUMB_WIDTH = 512
+MIN_HEADSHOT_DIMENSION = 256  # either side must reach this many pixels
+SUPABASE_BATCH_SIZE = 50  # starting size; adapted to observed latency
+SUPABASE_MIN_BATCH_SIZE = 10
+SUPABASE_MAX_BATCH_SIZE = 500
+SUPABASE_MAX_PAYLOAD_BYTES = 2 * 1024 * 1024
+SUPABASE_TARGET_LATENCY = 2.0  # seconds per batch POST
+SUPABASE_CONCURRENCY = 4  # batches in flight per table
+SUPABASE_MAX_RETRIES = 5
+SUPABASE_SPLIT_STATUSES = (400, 409, 413, 422)  # row-level rejections worth bisecting
+
+# HTTP response cache (survives deleting _intermediate/)
+HTTP_CACHE_TTLS = {
+    WIKIDATA_SPARQL_URL: 3 * 24 * 3600,
+    COMMONS_API_URL: 30 * 24 * 3600,
+}
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024
+HTTP_CACHE = HttpCache(
+    CACHE_DIR / "http_cache.sqlite",
+    ttls=HTTP_CACHE_TTLS,
+    max_bytes=HTTP_CACHE_MAX_BYTES,
+)
 
 # Current date for age checks
 CURRENT_YEAR = datetime.now(timezone.utc).year
@@ -73,7 +121,7 @@ log = logging.getLogger("seed_pipeline")
 # ── Data Model ───────────────────────────────────────────────────────
 
 
-@dataclass
+@dataclass(slots=True)
 class Candidate:
     qid: str
     name: str
@@ -93,9 +141,17 @@ class Candidate:
     headshot_height: int = 0
     source_urls: list = field(default_factory=list)
     last_verified_at: str = ""
+    revision: str = ""  # Wikidata lastrevid at discovery time
 
 
-@dataclass
+CANDIDATE_FIELDS = tuple(f.name for f in fields(Candidate))
+_candidate_values = attrgetter(*CANDIDATE_FIELDS)
+
+# Low-cardinality strings, interned on load so rows share one copy of each value
+INTERNED_FIELDS = ("profession", "category", "gender", "headshot_source", "headshot_license")
+
+
+@dataclass(slots=True)
 class AuditEntry:
     person_qid: str
     person_name: str
@@ -204,6 +260,7 @@ def build_occupation_query(
     limit: int,
     min_birth_year: int,
     gender_filter: Optional[str] = None,
+    max_birth_year: int = MIN_BIRTH_YEAR_FOR_ADULT,
 ) -> str:
     """Build a SPARQL query for humans with given occupations, image, DOB."""
     values = " ".join(f"wd:{q}" for q in occupation_qids)
@@ -214,6 +271,7 @@ def build_occupation_query(
     return f"""
 SELECT DISTINCT ?person ?personLabel ?personDescription ?image ?birthDate
        ?genderLabel ?twitterHandle ?instagramHandle ?tiktokHandle ?youtubeChannelId
+       ?revision
 WHERE {{
   ?person wdt:P31 wd:Q5 ;
           wdt:P18 ?image ;
@@ -222,8 +280,9 @@ WHERE {{
   ?person wdt:P106 ?occupation .
   {gender_clause}
   FILTER(YEAR(?birthDate) >= {min_birth_year})
-  FILTER(YEAR(?birthDate) <= {MIN_BIRTH_YEAR_FOR_ADULT})
+  FILTER(YEAR(?birthDate) <= {min(max_birth_year, MIN_BIRTH_YEAR_FOR_ADULT)})
 
+  OPTIONAL {{ ?person schema:version ?revision . }}
   OPTIONAL {{ ?person wdt:P21 ?gender . }}
   OPTIONAL {{ ?person wdt:P2002 ?twitterHandle . }}
   OPTIONAL {{ ?person wdt:P2003 ?instagramHandle . }}
@@ -236,19 +295,25 @@ LIMIT {limit}
 """
 
 
-def build_tiktok_handle_query(limit: int = 500) -> str:
+def build_tiktok_handle_query(
+    limit: int = 500,
+    min_birth_year: int = 1985,
+    max_birth_year: int = MIN_BIRTH_YEAR_FOR_ADULT,
+) -> str:
     """Find people who have a TikTok handle and an image."""
     return f"""
 SELECT DISTINCT ?person ?personLabel ?personDescription ?image ?birthDate
        ?genderLabel ?twitterHandle ?instagramHandle ?tiktokHandle ?youtubeChannelId
+       ?revision
 WHERE {{
   ?person wdt:P31 wd:Q5 ;
           wdt:P18 ?image ;
           wdt:P569 ?birthDate ;
           wdt:P7085 ?tiktokHandle .
-  FILTER(YEAR(?birthDate) >= 1985)
-  FILTER(YEAR(?birthDate) <= {MIN_BIRTH_YEAR_FOR_ADULT})
+  FILTER(YEAR(?birthDate) >= {min_birth_year})
+  FILTER(YEAR(?birthDate) <= {min(max_birth_year, MIN_BIRTH_YEAR_FOR_ADULT)})
 
+  OPTIONAL {{ ?person schema:version ?revision . }}
   OPTIONAL {{ ?person wdt:P21 ?gender . }}
   OPTIONAL {{ ?person wdt:P2002 ?twitterHandle . }}
   OPTIONAL {{ ?person wdt:P2003 ?instagramHandle . }}
@@ -260,19 +325,25 @@ LIMIT {limit}
 """
 
 
-def build_youtube_channel_query(limit: int = 350) -> str:
+def build_youtube_channel_query(
+    limit: int = 350,
+    min_birth_year: int = 1980,
+    max_birth_year: int = MIN_BIRTH_YEAR_FOR_ADULT,
+) -> str:
     """Find people who have a YouTube channel ID and an image."""
     return f"""
 SELECT DISTINCT ?person ?personLabel ?personDescription ?image ?birthDate
        ?genderLabel ?twitterHandle ?instagramHandle ?tiktokHandle ?youtubeChannelId
+       ?revision
 WHERE {{
   ?person wdt:P31 wd:Q5 ;
           wdt:P18 ?image ;
           wdt:P569 ?birthDate ;
           wdt:P2397 ?youtubeChannelId .
-  FILTER(YEAR(?birthDate) >= 1980)
-  FILTER(YEAR(?birthDate) <= {MIN_BIRTH_YEAR_FOR_ADULT})
+  FILTER(YEAR(?birthDate) >= {min_birth_year})
+  FILTER(YEAR(?birthDate) <= {min(max_birth_year, MIN_BIRTH_YEAR_FOR_ADULT)})
 
+  OPTIONAL {{ ?person schema:version ?revision . }}
   OPTIONAL {{ ?person wdt:P21 ?gender . }}
   OPTIONAL {{ ?person wdt:P2002 ?twitterHandle . }}
   OPTIONAL {{ ?person wdt:P2003 ?instagramHandle . }}
@@ -284,11 +355,16 @@ LIMIT {limit}
 """
 
 
-def build_meme_subjects_query(limit: int = 250) -> str:
+def build_meme_subjects_query(
+    limit: int = 250,
+    min_birth_year: int = 1960,
+    max_birth_year: int = MIN_BIRTH_YEAR_FOR_ADULT,
+) -> str:
     """Find people who are subjects of internet memes."""
     return f"""
 SELECT DISTINCT ?person ?personLabel ?personDescription ?image ?birthDate
        ?genderLabel ?twitterHandle ?instagramHandle ?tiktokHandle ?youtubeChannelId
+       ?revision
 WHERE {{
   {{
     ?person wdt:P31 wd:Q5 ;
@@ -305,9 +381,10 @@ WHERE {{
     ?meme wdt:P31/wdt:P279* wd:Q2927074 ;
           wdt:P180 ?person .
   }}
-  FILTER(YEAR(?birthDate) >= 1960)
-  FILTER(YEAR(?birthDate) <= {MIN_BIRTH_YEAR_FOR_ADULT})
+  FILTER(YEAR(?birthDate) >= {min_birth_year})
+  FILTER(YEAR(?birthDate) <= {min(max_birth_year, MIN_BIRTH_YEAR_FOR_ADULT)})
 
+  OPTIONAL {{ ?person schema:version ?revision . }}
   OPTIONAL {{ ?person wdt:P21 ?gender . }}
   OPTIONAL {{ ?person wdt:P2002 ?twitterHandle . }}
   OPTIONAL {{ ?person wdt:P2003 ?instagramHandle . }}
@@ -320,43 +397,184 @@ LIMIT {limit}
 """
 
 
+EXTRA_QUERY_BUILDERS = {
+    "tiktok_handle_holders": (build_tiktok_handle_query, 1985),
+    "youtube_channel_holders": (build_youtube_channel_query, 1980),
+    "meme_subjects": (build_meme_subjects_query, 1960),
+}
+
+
+@dataclass
+class QueryChunk:
+    """One independently runnable slice of a category's discovery query.
+
+    A chunk covers a single occupation QID (or one extra query) over a
+    birth-year range, halved until it finishes inside the WDQS timeout.
+    Its `limit` is the whole query's; iter_discovered gives each chunk its
+    share of what is still missing when the chunk runs.
+    """
+    category: str
+    label: str
+    min_birth_year: int
+    max_birth_year: int
+    limit: int
+    occupations: list = field(default_factory=list)
+    gender_filter: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.category}/{self.label}[{self.min_birth_year}-{self.max_birth_year}]"
+
+    def query(self) -> str:
+        if self.occupations:
+            return build_occupation_query(
+                occupation_qids=self.occupations,
+                limit=self.limit,
+                min_birth_year=self.min_birth_year,
+                gender_filter=self.gender_filter,
+                max_birth_year=self.max_birth_year,
+            )
+        builder, _ = EXTRA_QUERY_BUILDERS[self.label]
+        return builder(self.limit, self.min_birth_year, self.max_birth_year)
+
+    def split(self) -> list["QueryChunk"]:
+        """Halve the birth-year range; a single-year chunk cannot be split."""
+        if self.max_birth_year <= self.min_birth_year:
+            return []
+        mid = (self.min_birth_year + self.max_birth_year) // 2
+        return [
+            QueryChunk(**{**asdict(self), "max_birth_year": mid}),
+            QueryChunk(**{**asdict(self), "min_birth_year": mid + 1}),
+        ]
+
+
+def build_query_chunks(
+    category: str,
+    label: str,
+    limit: int,
+    min_birth_year: int,
+    occupations: Optional[list[str]] = None,
+    gender_filter: Optional[str] = None,
+) -> list[QueryChunk]:
+    """Split a category query by occupation QID.
+
+    Each chunk spans every birth year; one that times out is narrowed by
+    QueryChunk.split when it runs, so only slow occupations pay for extra
+    queries.
+    """
+    return [
+        QueryChunk(
+            category=category,
+            label=f"{label}:{occupation}" if occupation else label,
+            min_birth_year=min_birth_year,
+            max_birth_year=MIN_BIRTH_YEAR_FOR_ADULT,
+            limit=limit,
+            occupations=[occupation] if occupation else [],
+            gender_filter=gender_filter,
+        )
+        for occupation in occupations or [None]
+    ]
+
+
 # ── Wikidata Client ──────────────────────────────────────────────────
 
 
-def run_sparql_query(query: str) -> list[dict]:
-    """Execute a SPARQL query against Wikidata and return results."""
+class SparqlQueryError(Exception):
+    """Raised by run_sparql_query(strict=True) when every attempt failed."""
+
+
+class SparqlTimeout(SparqlQueryError):
+    """The last attempt ran out of time; a narrower query may still succeed."""
+
+
+def run_sparql_query(
+    query: str,
+    throttle: Optional["AdaptiveConcurrency"] = None,
+    strict: bool = False,
+    retry_timeouts: bool = True,
+) -> list[dict]:
+    """Execute a SPARQL query against Wikidata and return results.
+
+    When a `throttle` is given, 429s and timeouts are reported to it so
+    that concurrent callers back off together. With `strict`, failure after
+    all attempts raises SparqlQueryError (SparqlTimeout when the last
+    attempt timed out) instead of returning []. Without `retry_timeouts`
+    the first timeout ends the attempts, for callers that would rather
+    narrow the query than repeat it.
+    """
     headers = {
         "Accept": "application/sparql-results+json",
         "User-Agent": USER_AGENT,
     }
     params = {"query": query, "format": "json"}
 
+    timed_out = False
     for attempt in range(3):
+        if throttle:
+            throttle.wait_if_paused()
         try:
-            resp = requests.get(
+            resp = HTTP_CACHE.get(
                 WIKIDATA_SPARQL_URL,
                 params=params,
                 headers=headers,
                 timeout=90,
             )
             if resp.status_code == 429:
-                wait = 30 * (attempt + 1)
-                log.warning(f"Rate limited by Wikidata, waiting {wait}s...")
+                wait = _retry_after_seconds(resp, default=30 * (attempt + 1))
+                log.warning(f"Rate limited by Wikidata, waiting {wait:.0f}s...")
+                if throttle:
+                    throttle.on_throttled(wait)
                 time.sleep(wait)
                 continue
             resp.raise_for_status()
             data = resp.json()
+            if throttle:
+                throttle.on_success()
             return data.get("results", {}).get("bindings", [])
         except requests.exceptions.Timeout:
+            timed_out = True
             log.warning(f"SPARQL query timed out (attempt {attempt + 1}/3)")
+            if throttle:
+                throttle.on_throttled(0)
+            if not retry_timeouts:
+                break
             time.sleep(10)
         except Exception as e:
+            timed_out = _is_query_timeout(e)
             log.error(f"SPARQL query failed: {e}")
+            if timed_out and not retry_timeouts:
+                break
             if attempt < 2:
                 time.sleep(5)
+    if strict:
+        error = SparqlTimeout if timed_out else SparqlQueryError
+        raise error("SPARQL query failed after 3 attempts")
+    log.error("SPARQL query failed after 3 attempts, returning no results")
     return []
 
 
+def _is_query_timeout(e: Exception) -> bool:
+    """WDQS reports a query that ran past its time limit as a 5xx naming TimeoutException."""
+    resp = getattr(e, "response", None)
+    return resp is not None and resp.status_code >= 500 and "TimeoutException" in resp.text
+
+
+def _retry_after_seconds(resp: requests.Response, default: float) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP date)."""
+    value = resp.headers.get("Retry-After", "").strip()
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
 def extract_qid(uri: str) -> str:
     """Extract QID from a Wikidata entity URI."""
     return uri.rsplit("/", 1)[-1] if uri else ""
@@ -386,6 +604,7 @@ def parse_sparql_results(results: list[dict], category: str) -> list[Candidate]:
         image_uri = row.get("image", {}).get("value", "")
         birth_str = row.get("birthDate", {}).get("value", "")
         gender = row.get("genderLabel", {}).get("value", "")
+        revision = row.get("revision", {}).get("value", "")
 
         # Parse birth year
         birth_year = None
@@ -425,6 +644,7 @@ def parse_sparql_results(results: list[dict], category: str) -> list[Candidate]:
             headshot_filename=headshot_filename,
             headshot_url=image_uri,
             source_urls=[f"https://www.wikidata.org/wiki/{qid}"],
+            revision=revision,
         )
         candidates[qid] = c
 
@@ -454,312 +674,591 @@ def _merge_handles(candidate: Candidate, row: dict):
 # ── Step 1: Candidate Discovery ─────────────────────────────────────
 
 
-def discover_candidates() -> list[Candidate]:
+def discover_candidates(
+    concurrency: int = SPARQL_CONCURRENCY, refresh: bool = False
+) -> list[Candidate]:
     """Run all SPARQL queries and collect candidates."""
-    cache_file = INTERMEDIATE_DIR / "candidates_raw.jsonl"
-    if cache_file.exists():
-        log.info(f"Loading cached raw candidates from {cache_file}")
-        return _load_candidates(cache_file)
+    stage = CHECKPOINTS.stage("raw", discovery_config())
+    cached = None if refresh else CHECKPOINTS.load(stage)
+    if cached is not None:
+        log.info(f"Loading cached raw candidates from {stage.path}")
+        return cached
+
+    failed: list[str] = []
+    all_candidates = list(iter_discovered(concurrency, failed))
+    log.info(f"Total raw candidates: {len(all_candidates)}")
+    if failed:
+        log.warning(f"{len(failed)} discovery chunks failed")
+    CHECKPOINTS.save(stage, all_candidates, failures=failed)
+    return all_candidates
 
-    all_candidates: list[Candidate] = []
-    seen_qids: set[str] = set()
 
-    for category, config in CATEGORY_CONFIG.items():
-        log.info(f"── Discovering: {category} ──")
+def discovery_config() -> dict:
+    """Everything that determines discovery output: the rendered chunk queries."""
+    return {
+        "queries": [chunk.query() for *_, chunks in _discovery_jobs() for chunk in chunks],
+    }
 
-        # Primary query: occupation-based
-        query = build_occupation_query(
-            occupation_qids=config["occupations"],
-            limit=config["limit"],
-            min_birth_year=config["min_birth_year"],
-            gender_filter=config.get("gender_filter"),
-        )
-        log.info(f"  Running primary SPARQL query (limit {config['limit']})...")
-        results = run_sparql_query(query)
-        candidates = parse_sparql_results(results, category)
-        new_count = 0
-        for c in candidates:
-            if c.qid not in seen_qids:
-                seen_qids.add(c.qid)
-                all_candidates.append(c)
-                new_count += 1
-        log.info(f"  Primary query: {len(results)} results → {new_count} new candidates")
-        time.sleep(SPARQL_DELAY)
 
-        # Extra queries for specific categories
-        extra_queries = config.get("extra_queries", [])
-        for eq in extra_queries:
-            if eq == "tiktok_handle_holders":
-                log.info("  Running extra query: TikTok handle holders...")
-                q = build_tiktok_handle_query(config["limit"])
-            elif eq == "youtube_channel_holders":
-                log.info("  Running extra query: YouTube channel holders...")
-                q = build_youtube_channel_query(config["limit"])
-            elif eq == "meme_subjects":
-                log.info("  Running extra query: meme subjects...")
-                q = build_meme_subjects_query(config["limit"])
-            else:
+def iter_discovered(
+    concurrency: int = SPARQL_CONCURRENCY, failed: Optional[list[str]] = None
+) -> Iterator[Candidate]:
+    """Yield discovered candidates as each discovery query completes.
+
+    Each category query is split into QueryChunks. Queries run in
+    parallel under an AIMD concurrency limit, and the chunks of one query
+    run in turn, each asking for an even share of the people the query
+    still lacks, so a query fetches about its limit in total and stops
+    once it has it. A chunk that keeps timing out is split into smaller
+    birth-year ranges and retried on its own; chunks that still fail are
+    logged and appended to `failed`. Chunk rows are merged per query
+    through parse_sparql_results, and queries are yielded in
+    CATEGORY_CONFIG order so the first category to claim a QID keeps it,
+    exactly as in a serial run.
+    """
+    jobs = _discovery_jobs()
+    chunks = [chunk for _, _, _, job_chunks in jobs for chunk in job_chunks]
+    log.info(
+        f"Running {len(jobs)} discovery queries over up to {len(chunks)} chunks "
+        f"({concurrency} queries in parallel)..."
+    )
+    throttle = AdaptiveConcurrency(concurrency)
+    stats: list[dict] = []
+
+    def run_job(limit: int, job_chunks: list[QueryChunk]) -> list[dict]:
+        rows: list[dict] = []
+        people: set[str] = set()
+        pending = list(job_chunks)
+        while pending and len(people) < limit:
+            share = -(-(limit - len(people)) // len(pending))  # ceiling division
+            chunk = replace(pending.pop(0), limit=share)
+            results = run(chunk)
+            if results is None:  # timed out: the halves take its place and share
+                pending[:0] = chunk.split()
                 continue
-
-            results = run_sparql_query(q)
-            candidates = parse_sparql_results(results, category)
+            rows += results
+            people.update(row.get("person", {}).get("value", "") for row in results)
+        return rows
+
+    def run(chunk: QueryChunk) -> Optional[list[dict]]:
+        """The chunk's rows, or None when it timed out and can be split."""
+        with throttle:
+            started = time.monotonic()
+            error = None
+            try:
+                results = run_sparql_query(
+                    chunk.query(), throttle, strict=True, retry_timeouts=not chunk.split()
+                )
+            except SparqlQueryError as e:
+                results, error = [], e
+            latency = round(time.monotonic() - started, 2)
+        stats.append({
+            "category": chunk.category,
+            "chunk": chunk.name,
+            "rows": len(results),
+            "latency_s": latency,
+            "failed": error is not None,
+        })
+        if error is not None:
+            if isinstance(error, SparqlTimeout) and chunk.split():
+                log.warning(f"  {chunk.name}: timed out, retrying as smaller chunks")
+                return None
+            log.error(f"  {chunk.name}: failed, its rows are missing from this run")
+            if failed is not None:
+                failed.append(chunk.name)
+            return []
+        log.info(f"  {chunk.name}: {len(results)} rows in {latency}s")
+        return results
+
+    started = time.monotonic()
+    seen_qids: set[str] = set()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [pool.submit(run_job, limit, job_chunks) for _, _, limit, job_chunks in jobs]
+        for (category, label, limit, _), future in zip(jobs, futures):
+            rows = future.result()
+            candidates = parse_sparql_results(rows, category)[:limit]
             new_count = 0
             for c in candidates:
                 if c.qid not in seen_qids:
                     seen_qids.add(c.qid)
-                    all_candidates.append(c)
                     new_count += 1
-            log.info(f"  Extra query ({eq}): {len(results)} results → {new_count} new candidates")
-            time.sleep(SPARQL_DELAY)
+                    yield c
+            log.info(f"  {category}/{label}: {len(rows)} results → {new_count} new candidates")
+
+    elapsed = time.monotonic() - started
+    slowest = max((st["latency_s"] for st in stats), default=0)
+    log.info(
+        f"Discovery finished in {elapsed:.1f}s ({len(stats)} queries, slowest chunk "
+        f"{slowest:.1f}s, {sum(st['failed'] for st in stats)} failed, "
+        f"final concurrency {throttle.limit})"
+    )
+    with open(OUTPUT_DIR / "discovery_stats.json", "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2)
+
+
+def _discovery_jobs() -> list[tuple[str, str, int, list[QueryChunk]]]:
+    """List (category, label, limit, chunks) for every configured discovery query."""
+    jobs = []
+    for category, config in CATEGORY_CONFIG.items():
+        # Primary query: occupation-based
+        jobs.append((category, "primary", config["limit"], build_query_chunks(
+            category, "primary", config["limit"], config["min_birth_year"],
+            occupations=config["occupations"],
+            gender_filter=config.get("gender_filter"),
+        )))
 
-    log.info(f"Total raw candidates: {len(all_candidates)}")
-    _save_candidates(all_candidates, cache_file)
-    return all_candidates
+        # Extra queries for specific categories
+        for eq in config.get("extra_queries", []):
+            if eq not in EXTRA_QUERY_BUILDERS:
+                continue
+            _, min_birth_year = EXTRA_QUERY_BUILDERS[eq]
+            jobs.append((category, eq, config["limit"], build_query_chunks(
+                category, eq, config["limit"], min_birth_year,
+            )))
+    return jobs
 
 
 # ── Step 2: Headshot Resolution ──────────────────────────────────────
 
 
-def resolve_headshots(candidates: list[Candidate]) -> list[Candidate]:
-    """Resolve headshot URLs, licenses, and attribution from Commons."""
-    cache_file = INTERMEDIATE_DIR / "candidates_with_headshots.jsonl"
-    if cache_file.exists():
-        log.info(f"Loading cached headshot data from {cache_file}")
-        return _load_candidates(cache_file)
-
-    log.info(f"Resolving headshots for {len(candidates)} candidates...")
-    resolved = []
-
-    for c in tqdm(candidates, desc="Resolving headshots"):
-        if not c.headshot_filename:
-            continue
-
-        info = _fetch_commons_image_info(c.headshot_filename)
-        if not info:
-            continue
-
-        # Extract license
-        ext = info.get("extmetadata", {})
-        license_name = ext.get("LicenseShortName", {}).get("value", "")
-        attribution = ext.get("Artist", {}).get("value", "")
-        # Clean HTML from attribution
-        attribution = re.sub(r"<[^>]+>", "", attribution).strip()
-
-        width = info.get("width", 0)
-        height = info.get("height", 0)
-
-        # Build the stable Commons URL (thumb at 512px)
-        thumb_url = info.get("thumburl", "")
-        original_url = info.get("url", "")
-        display_url = thumb_url if thumb_url else original_url
-
-        c.headshot_url = display_url
-        c.headshot_source = f"https://commons.wikimedia.org/wiki/File:{urllib.parse.quote(c.headshot_filename)}"
-        c.headshot_license = license_name
-        c.headshot_attribution = attribution
-        c.headshot_width = width
-        c.headshot_height = height
-        c.last_verified_at = datetime.now(timezone.utc).isoformat()
-
-        resolved.append(c)
-        time.sleep(COMMONS_API_DELAY)
+def resolve_headshots(
+    candidates: list[Candidate],
+    concurrency: int = COMMONS_CONCURRENCY,
+    requests_per_second: float = COMMONS_REQUESTS_PER_SECOND,
+    refresh: bool = False,
+) -> list[Candidate]:
+    """Resolve headshot URLs, licenses, and attribution from Commons.
+
+    Filenames are looked up in multi-title batches on a bounded thread
+    pool that shares a token-bucket rate limiter; results keep the input
+    order.
+    """
+    stage = CHECKPOINTS.stage("headshots", HEADSHOT_CONFIG, digest_candidates(candidates))
+    cached = None if refresh else CHECKPOINTS.load(stage)
+    if cached is not None:
+        log.info(f"Loading cached headshot data from {stage.path}")
+        return cached
+
+    log.info(
+        f"Resolving headshots for {len(candidates)} candidates "
+        f"({concurrency} workers, {requests_per_second:g} req/s)..."
+    )
+    failed: list[str] = []
+    resolved = list(iter_resolved(
+        tqdm(candidates, desc="Resolving headshots"),
+        concurrency=concurrency,
+        requests_per_second=requests_per_second,
+        failed=failed,
+    ))
 
     log.info(f"Headshots resolved: {len(resolved)} / {len(candidates)}")
-    _save_candidates(resolved, cache_file)
+    if failed:
+        log.warning(f"{len(failed)} Commons lookups failed")
+    CHECKPOINTS.save(stage, resolved, failures=failed)
     return resolved
 
 
-def _fetch_commons_image_info(filename: str) -> Optional[dict]:
+def iter_resolved(
+    candidates: Iterable[Candidate],
+    concurrency: int = COMMONS_CONCURRENCY,
+    requests_per_second: float = COMMONS_REQUESTS_PER_SECOND,
+    failed: Optional[list[str]] = None,
+) -> Iterator[Candidate]:
+    """Yield candidates whose Commons headshot resolved, in input order.
+
+    Input is consumed lazily in batches of COMMONS_TITLES_PER_REQUEST; each
+    batch becomes one multi-title Commons request on a bounded thread pool
+    sharing a token-bucket rate limiter. At most 2 × concurrency batches
+    are in flight, so memory stays bounded however long the input is.
+    Filenames whose lookup failed (as opposed to files Commons doesn't
+    have) are appended to `failed`.
+    """
+    limiter = RateLimiter(requests_per_second)
+    with_files = (c for c in candidates if c.headshot_filename)
+    in_flight: deque = deque()
+
+    def finish(batch: list[Candidate], future) -> Iterator[Candidate]:
+        infos = future.result()
+        for c in batch:
+            info = infos.get(c.headshot_filename)
+            if info:
+                _apply_image_info(c, info)
+                yield c
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for batch in _batched(with_files, COMMONS_TITLES_PER_REQUEST):
+            filenames = list(dict.fromkeys(c.headshot_filename for c in batch))
+            in_flight.append((batch, pool.submit(
+                _fetch_commons_image_info_batch, filenames, limiter, failed
+            )))
+            while in_flight and (
+                len(in_flight) > 2 * concurrency or in_flight[0][1].done()
+            ):
+                yield from finish(*in_flight.popleft())
+        while in_flight:
+            yield from finish(*in_flight.popleft())
+
+
+def _apply_image_info(c: Candidate, info: dict):
+    """Copy license, attribution, dimensions, and URLs from Commons imageinfo."""
+    # Extract license
+    ext = info.get("extmetadata", {})
+    license_name = ext.get("LicenseShortName", {}).get("value", "")
+    attribution = ext.get("Artist", {}).get("value", "")
+    # Clean HTML from attribution
+    attribution = re.sub(r"<[^>]+>", "", attribution).strip()
+
+    width = info.get("width", 0)
+    height = info.get("height", 0)
+
+    # Build the stable Commons URL (thumb at COMMONS_THUMB_WIDTH)
+    thumb_url = info.get("thumburl", "")
+    original_url = info.get("url", "")
+    display_url = thumb_url if thumb_url else original_url
+
+    c.headshot_url = display_url
+    c.headshot_source = f"https://commons.wikimedia.org/wiki/File:{urllib.parse.quote(c.headshot_filename)}"
+    c.headshot_license = license_name
+    c.headshot_attribution = attribution
+    c.headshot_width = width
+    c.headshot_height = height
+    c.last_verified_at = datetime.now(timezone.utc).isoformat()
+
+
+def _fetch_commons_image_info(
+    filename: str, limiter: Optional["RateLimiter"] = None
+) -> Optional[dict]:
     """Fetch image info (license, dimensions, thumb URL) from Commons API."""
+    return _fetch_commons_image_info_batch([filename], limiter).get(filename)
+
+
+def _fetch_commons_image_info_batch(
+    filenames: list[str],
+    limiter: Optional["RateLimiter"] = None,
+    failed: Optional[list[str]] = None,
+    split_on_error: bool = True,
+) -> dict[str, dict]:
+    """Fetch image info for up to COMMONS_TITLES_PER_REQUEST files in one query.
+
+    Returns a mapping of requested filename → imageinfo. Titles that Commons
+    normalizes or redirects are followed back to the requested filename;
+    missing files are left out.
+
+    A batch whose request keeps failing is split in half and retried. A 414
+    (the URL for many non-ASCII titles is too long) keeps splitting down to
+    single titles; any other error splits only once, so an outage costs a
+    few requests per batch rather than one per title. Filenames still
+    unresolved are logged and appended to `failed`.
+    """
     params = {
         "action": "query",
-        "titles": f"File:{filename}",
+        "titles": "|".join(f"File:{f}" for f in filenames),
         "prop": "imageinfo",
         "iiprop": "extmetadata|url|size|thumburl",
-        "iiurlwidth": 512,
+        "iiurlwidth": COMMONS_THUMB_WIDTH,
+        "redirects": 1,
         "format": "json",
     }
     headers = {"User-Agent": USER_AGENT}
 
+    renamed: dict[str, str] = {}
+    by_title: dict[str, dict] = {}
+    cont: dict = {}
+    while True:
+        too_long = False
+        try:
+            data = _commons_query({**params, **cont}, headers, limiter)
+        except requests.HTTPError:
+            data, too_long = None, True
+        if data is None:
+            if len(filenames) > 1 and (too_long or split_on_error):
+                half = len(filenames) // 2
+                return {
+                    **_fetch_commons_image_info_batch(filenames[:half], limiter, failed, too_long),
+                    **_fetch_commons_image_info_batch(filenames[half:], limiter, failed, too_long),
+                }
+            log.warning(
+                f"Commons lookup failed for {len(filenames)} file(s), "
+                f"starting with {filenames[0]}"
+            )
+            if failed is not None:
+                failed.extend(filenames)
+            return {}
+        query = data.get("query", {})
+        for entry in query.get("normalized", []) + query.get("redirects", []):
+            renamed[entry["from"]] = entry["to"]
+        for page in query.get("pages", {}).values():
+            ii = page.get("imageinfo", [])
+            if ii and "missing" not in page:
+                by_title.setdefault(page.get("title", ""), ii[0])
+        cont = data.get("continue", {})
+        if not cont:
+            break
+
+    infos = {}
+    for filename in filenames:
+        title = f"File:{filename}"
+        # normalized → redirect chains are at most a couple of hops
+        for _ in range(3):
+            if title not in renamed:
+                break
+            title = renamed[title]
+        if title in by_title:
+            infos[filename] = by_title[title]
+    return infos
+
+
+def _commons_query(
+    params: dict, headers: dict, limiter: Optional["RateLimiter"] = None
+) -> Optional[dict]:
+    """Run one Commons API request with retries; return parsed JSON or None.
+
+    A 414 is raised as HTTPError instead: the same URL would fail again,
+    so the caller has to ask for fewer titles.
+    """
     for attempt in range(3):
+        if limiter:
+            limiter.acquire()
+        else:
+            time.sleep(COMMONS_API_DELAY)
         try:
-            resp = requests.get(
-                COMMONS_API_URL, params=params, headers=headers, timeout=15
+            resp = HTTP_CACHE.get(
+                COMMONS_API_URL, params=params, headers=headers, timeout=30
             )
             resp.raise_for_status()
-            data = resp.json()
-            pages = data.get("query", {}).get("pages", {})
-            for page in pages.values():
-                ii = page.get("imageinfo", [])
-                if ii:
-                    return ii[0]
-            return None
+            return resp.json()
         except Exception as e:
-            log.debug(f"Commons API error for {filename}: {e}")
+            if isinstance(e, requests.HTTPError) and e.response.status_code == 414:
+                raise
+            log.debug(f"Commons API error for {params.get('titles', '')[:80]}: {e}")
             if attempt < 2:
                 time.sleep(2)
     return None
 
 
+HEADSHOT_CONFIG = {"thumb_width": COMMONS_THUMB_WIDTH, "version": 1}
+
+
 # ── Step 3: Safety Filtering ────────────────────────────────────────
 
 
-def apply_safety_filters(
-    candidates: list[Candidate], audit_log: list[AuditEntry]
-) -> list[Candidate]:
-    """Remove minors, suspected minors, and records without compliant headshots."""
-    cache_file = INTERMEDIATE_DIR / "candidates_filtered.jsonl"
-    if cache_file.exists():
-        log.info(f"Loading cached filtered candidates from {cache_file}")
-        return _load_candidates(cache_file)
+_MINOR_SIGNAL_NEEDLES = [(signal, signal.lower()) for signal in SUSPECTED_MINOR_SIGNALS]
 
-    log.info(f"Applying safety filters to {len(candidates)} candidates...")
-    safe = []
 
-    for c in candidates:
-        # Filter: must have birth year
-        if c.birth_year is None:
-            audit_log.append(AuditEntry(
-                person_qid=c.qid,
-                person_name=c.name,
-                action="excluded",
-                details={"reason": "missing_birth_year"},
-            ))
-            continue
+def _minor_signal(description: str) -> Optional[str]:
+    """The first SUSPECTED_MINOR_SIGNALS entry mentioned in `description`, if any.
 
-        # Filter: must be 18+
-        if c.birth_year > MIN_BIRTH_YEAR_FOR_ADULT:
-            audit_log.append(AuditEntry(
-                person_qid=c.qid,
-                person_name=c.name,
-                action="excluded",
-                details={"reason": "under_18", "birth_year": c.birth_year},
-            ))
-            continue
+    A signal must start a word, and a numeric one must also end one, so
+    "16" matches "aged 16" but not "2016" or "160 cm", while "teen" still
+    matches "teenager". Plain `str.find` plus a look at the neighbouring
+    characters is several times faster here than a word-boundary regex.
+    """
+    text = description.lower()
+    for signal, needle in _MINOR_SIGNAL_NEEDLES:
+        pos = text.find(needle)
+        while pos != -1:
+            end = pos + len(needle)
+            if not (pos and _word_char(text[pos - 1])) and not (
+                needle[-1].isdigit() and end < len(text) and _word_char(text[end])
+            ):
+                return signal
+            pos = text.find(needle, pos + 1)
+    return None
 
-        # Filter: check suspected minor signals in description
-        desc_lower = (c.description or "").lower()
-        is_suspected = False
-        for signal in SUSPECTED_MINOR_SIGNALS:
-            if signal.lower() in desc_lower:
-                is_suspected = True
-                audit_log.append(AuditEntry(
-                    person_qid=c.qid,
-                    person_name=c.name,
-                    action="excluded",
-                    details={
-                        "reason": "suspected_minor_signal",
-                        "signal": signal,
-                        "description": c.description,
-                    },
-                ))
-                break
-        if is_suspected:
-            continue
 
-        # Filter: must have a compliant headshot
-        if not c.headshot_url:
-            audit_log.append(AuditEntry(
-                person_qid=c.qid,
-                person_name=c.name,
-                action="excluded",
-                details={"reason": "no_headshot"},
-            ))
-            continue
+def _word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
 
-        # Filter: must have license info
-        if not c.headshot_license:
-            audit_log.append(AuditEntry(
-                person_qid=c.qid,
-                person_name=c.name,
-                action="excluded",
-                details={"reason": "no_license"},
-            ))
-            continue
 
-        # Filter: minimum image resolution (either dimension >= 256px)
-        if c.headshot_width < 256 and c.headshot_height < 256:
-            audit_log.append(AuditEntry(
-                person_qid=c.qid,
-                person_name=c.name,
-                action="excluded",
-                details={
-                    "reason": "image_too_small",
-                    "width": c.headshot_width,
-                    "height": c.headshot_height,
-                },
-            ))
-            continue
+def _safety_check(c: Candidate) -> AuditEntry:
+    """Decide whether one candidate is safe to publish; return the audit entry."""
+    # Filter: must have birth year
+    if c.birth_year is None:
+        return AuditEntry(
+            person_qid=c.qid,
+            person_name=c.name,
+            action="excluded",
+            details={"reason": "missing_birth_year"},
+        )
 
-        audit_log.append(AuditEntry(
+    # Filter: must be 18+
+    if c.birth_year > MIN_BIRTH_YEAR_FOR_ADULT:
+        return AuditEntry(
             person_qid=c.qid,
             person_name=c.name,
-            action="included",
-            details={"category": c.category, "birth_year": c.birth_year},
-        ))
-        safe.append(c)
+            action="excluded",
+            details={"reason": "under_18", "birth_year": c.birth_year},
+        )
+
+    # Filter: check suspected minor signals in description
+    signal = _minor_signal(c.description or "")
+    if signal:
+        return AuditEntry(
+            person_qid=c.qid,
+            person_name=c.name,
+            action="excluded",
+            details={
+                "reason": "suspected_minor_signal",
+                "signal": signal,
+                "description": c.description,
+            },
+        )
+
+    # Filter: must have a compliant headshot
+    if not c.headshot_url:
+        return AuditEntry(
+            person_qid=c.qid,
+            person_name=c.name,
+            action="excluded",
+            details={"reason": "no_headshot"},
+        )
+
+    # Filter: must have license info
+    if not c.headshot_license:
+        return AuditEntry(
+            person_qid=c.qid,
+            person_name=c.name,
+            action="excluded",
+            details={"reason": "no_license"},
+        )
+
+    # Filter: minimum image resolution (either dimension >= MIN_HEADSHOT_DIMENSION)
+    if c.headshot_width < MIN_HEADSHOT_DIMENSION and c.headshot_height < MIN_HEADSHOT_DIMENSION:
+        return AuditEntry(
+            person_qid=c.qid,
+            person_name=c.name,
+            action="excluded",
+            details={
+                "reason": "image_too_small",
+                "width": c.headshot_width,
+                "height": c.headshot_height,
+            },
+        )
+
+    return AuditEntry(
+        person_qid=c.qid,
+        person_name=c.name,
+        action="included",
+        details={"category": c.category, "birth_year": c.birth_year},
+    )
+
+
+def apply_safety_filters(
+    candidates: list[Candidate], audit_log: list[AuditEntry], refresh: bool = False
+) -> list[Candidate]:
+    """Remove minors, suspected minors, and records without compliant headshots."""
+    stage = CHECKPOINTS.stage("filtered", safety_config(), digest_candidates(candidates))
+    cached = None if refresh else CHECKPOINTS.load(stage, audit_log)
+    if cached is not None:
+        log.info(f"Loading cached filtered candidates from {stage.path}")
+        return cached
+
+    log.info(f"Applying safety filters to {len(candidates)} candidates...")
+    stage_audit = evaluate_safety(candidates)
+    safe = [c for c, entry in zip(candidates, stage_audit) if entry.action == "included"]
+    audit_log.extend(stage_audit)
 
     log.info(f"After safety filter: {len(safe)} / {len(candidates)}")
-    _save_candidates(safe, cache_file)
+    CHECKPOINTS.save(stage, safe, stage_audit)
     return safe
 
 
-# ── Step 4: Deduplication ────────────────────────────────────────────
+def safety_config() -> dict:
+    return {
+        "version": 2,  # word-boundary signal matching
+        "suspected_minor_signals": SUSPECTED_MINOR_SIGNALS,
+        "min_birth_year_for_adult": MIN_BIRTH_YEAR_FOR_ADULT,
+        "min_headshot_dimension": MIN_HEADSHOT_DIMENSION,
+    }
 
 
-def deduplicate(candidates: list[Candidate]) -> list[Candidate]:
-    """Deduplicate by QID, then by platform handles, then by fuzzy name."""
-    cache_file = INTERMEDIATE_DIR / "candidates_deduped.jsonl"
-    if cache_file.exists():
-        log.info(f"Loading cached deduped candidates from {cache_file}")
-        return _load_candidates(cache_file)
+def evaluate_safety(candidates: list[Candidate]) -> list[AuditEntry]:
+    """Return one audit entry per candidate, in order."""
+    with _gc_paused():
+        return [_safety_check(c) for c in candidates]
 
-    log.info(f"Deduplicating {len(candidates)} candidates...")
 
-    # Pass 1: QID dedup (should already be unique, but just in case)
-    by_qid: dict[str, Candidate] = {}
+def iter_safe(candidates: Iterable[Candidate], audit_log) -> Iterator[Candidate]:
+    """Yield candidates that pass the safety filters, checking each as it arrives.
+
+    Every decision is appended to `audit_log` (a list, or any sink with an
+    `append` method).
+    """
     for c in candidates:
-        if c.qid not in by_qid:
-            by_qid[c.qid] = c
-
-    # Pass 2: Handle-based dedup (same Twitter/IG/TikTok = same person)
-    handle_map: dict[str, str] = {}  # handle_key → qid
-    dupes_by_handle = set()
-    for c in by_qid.values():
-        for platform, handle in c.platform_handles.items():
-            key = f"{platform}:{handle.lower()}"
-            if key in handle_map and handle_map[key] != c.qid:
-                dupes_by_handle.add(c.qid)  # keep the first one
-            else:
-                handle_map[key] = c.qid
+        entry = _safety_check(c)
+        audit_log.append(entry)
+        if entry.action == "included":
+            yield c
 
-    # Pass 3: Fuzzy name dedup (normalized name collision)
-    name_map: dict[str, str] = {}  # normalized_name → qid
-    dupes_by_name = set()
-    for c in by_qid.values():
-        if c.qid in dupes_by_handle:
-            continue
-        norm = _normalize_name(c.name)
-        if norm in name_map and name_map[norm] != c.qid:
-            dupes_by_name.add(c.qid)  # keep the first one
-        else:
-            name_map[norm] = c.qid
 
-    all_dupes = dupes_by_handle | dupes_by_name
-    deduped = [c for c in by_qid.values() if c.qid not in all_dupes]
+# ── Step 4: Deduplication ────────────────────────────────────────────
+
+
+def deduplicate(candidates: list[Candidate], refresh: bool = False) -> list[Candidate]:
+    """Resolve candidates that are the same person and merge each cluster.
+
+    Clusters come from entity_resolution: records sharing a QID or platform
+    handle, or whose names match after blocking and scoring. The first
+    candidate of each cluster is kept; the others' names become its aliases
+    and fill in any platform handles it lacks.
+    """
+    stage = CHECKPOINTS.stage("deduped", DEDUP_CONFIG, digest_candidates(candidates))
+    cached = None if refresh else CHECKPOINTS.load(stage)
+    if cached is not None:
+        log.info(f"Loading cached deduped candidates from {stage.path}")
+        return cached
+
+    log.info(f"Deduplicating {len(candidates)} candidates...")
+    clusters = resolve([_entity(c) for c in candidates])
+    deduped = [_merge_cluster([candidates[i] for i in cluster]) for cluster in clusters]
 
-    removed = len(by_qid) - len(deduped)
+    removed = len({c.qid for c in candidates}) - len(deduped)
     log.info(f"Deduplication removed {removed} records → {len(deduped)} remain")
-    _save_candidates(deduped, cache_file)
+    CHECKPOINTS.save(stage, deduped)
     return deduped
 
 
-def _normalize_name(name: str) -> str:
-    """Normalize a name for fuzzy matching."""
-    n = name.lower().strip()
-    n = re.sub(r"[^a-z0-9\s]", "", n)
-    n = re.sub(r"\s+", " ", n)
-    return n
+def iter_deduped(candidates: Iterable[Candidate]) -> Iterator[Candidate]:
+    """Yield each candidate unless it matches one seen earlier in the stream.
+
+    Keeps only the blocking index in memory, so it can run over a stream.
+    Duplicates are dropped rather than merged, since their match has
+    already been yielded.
+    """
+    index = EntityIndex()
+    for c in candidates:
+        entity = _entity(c)
+        dupe_of = index.match(entity)
+        index.add(entity)
+        if dupe_of is None:
+            yield c
+        else:
+            log.debug(f"  Duplicate: {c.name} ({c.qid}) matches {dupe_of.name} ({dupe_of.key})")
+    log.info(f"Entity resolution: {index.stats()}")
+
+
+def _entity(c: Candidate) -> Entity:
+    return Entity(c.qid, c.name, c.platform_handles, c.birth_year)
+
+
+def _merge_cluster(cluster: list[Candidate]) -> Candidate:
+    """Keep the first candidate, folding in the others' names and missing handles."""
+    keeper, dupes = cluster[0], cluster[1:]
+    if not dupes:
+        return keeper
+    aliases = list(keeper.aliases)
+    handles = dict(keeper.platform_handles)
+    for d in dupes:
+        log.debug(f"  Merged {d.name} ({d.qid}) into {keeper.name} ({keeper.qid})")
+        for alias in [d.name, *d.aliases]:
+            if alias and alias != keeper.name and alias not in aliases:
+                aliases.append(alias)
+        for platform, handle in d.platform_handles.items():
+            handles.setdefault(platform, handle)
+    return replace(keeper, aliases=aliases, platform_handles=handles)
+
+
+DEDUP_CONFIG = {"version": 2, **resolution_config()}  # bump when the dedup rules change
 
 
 # ── Step 5: Export ───────────────────────────────────────────────────
@@ -774,24 +1273,21 @@ def export_jsonl(candidates: list[Candidate], path: Path):
     log.info(f"Exported {len(candidates)} records to {path}")
 
 
+CSV_FIELDNAMES = [
+    "name", "profession", "category", "aliases", "platform_handles",
+    "headshot_url", "headshot_source", "headshot_license",
+    "headshot_attribution", "source_urls", "wikidata_qid",
+    "birth_year", "last_verified_at",
+]
+
+
 def export_csv(candidates: list[Candidate], path: Path):
     """Export candidates to CSV format."""
-    fieldnames = [
-        "name", "profession", "category", "aliases", "platform_handles",
-        "headshot_url", "headshot_source", "headshot_license",
-        "headshot_attribution", "source_urls", "wikidata_qid",
-        "birth_year", "last_verified_at",
-    ]
     with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
         writer.writeheader()
         for c in candidates:
-            record = _candidate_to_record(c)
-            # Flatten lists/dicts for CSV
-            record["aliases"] = "; ".join(record.get("aliases", []))
-            record["platform_handles"] = json.dumps(record.get("platform_handles", {}))
-            record["source_urls"] = "; ".join(record.get("source_urls", []))
-            writer.writerow(record)
+            writer.writerow(_csv_row(c))
     log.info(f"Exported {len(candidates)} records to {path}")
 
 
@@ -799,12 +1295,25 @@ def export_audit_log(audit_log: list[AuditEntry], path: Path):
     """Export audit log to JSONL."""
     with open(path, "w", encoding="utf-8") as f:
         for entry in audit_log:
-            record = asdict(entry)
-            record["created_at"] = record["created_at"] or datetime.now(timezone.utc).isoformat()
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.write(json.dumps(_audit_record(entry), ensure_ascii=False) + "\n")
     log.info(f"Exported {len(audit_log)} audit entries to {path}")
 
 
+def _csv_row(c: Candidate) -> dict:
+    record = _candidate_to_record(c)
+    # Flatten lists/dicts for CSV
+    record["aliases"] = "; ".join(record.get("aliases", []))
+    record["platform_handles"] = json.dumps(record.get("platform_handles", {}))
+    record["source_urls"] = "; ".join(record.get("source_urls", []))
+    return record
+
+
+def _audit_record(entry: AuditEntry) -> dict:
+    record = asdict(entry)
+    record["created_at"] = record["created_at"] or datetime.now(timezone.utc).isoformat()
+    return record
+
+
 def _candidate_to_record(c: Candidate) -> dict:
     """Convert a Candidate to the output record schema."""
     return {
@@ -827,120 +1336,764 @@ def _candidate_to_record(c: Candidate) -> dict:
 # ── Step 6: Supabase Upload ─────────────────────────────────────────
 
 
-def upload_to_supabase(candidates: list[Candidate], audit_log: list[AuditEntry]):
-    """Upload candidates and audit log to Supabase."""
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        log.warning("Supabase credentials not set, skipping upload.")
-        return
+AUDIT_FIELDNAMES = ["person_qid", "person_name", "action", "details", "created_at"]
 
-    log.info(f"Uploading {len(candidates)} people to Supabase...")
 
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "resolution=merge-duplicates",
-    }
+def upload_to_supabase(
+    candidates: list[Candidate], audit_log: list[AuditEntry], loader: str = "rest"
+) -> set[str]:
+    """Upload candidates and audit log to Supabase.
 
-    # Upload people in batches
-    people_url = f"{SUPABASE_URL}/rest/v1/people"
-    success_count = 0
-    error_count = 0
+    Returns the QIDs of people rows that were written successfully.
+    """
+    if not upload_configured(loader):
+        return set()
 
-    for i in tqdm(range(0, len(candidates), SUPABASE_BATCH_SIZE), desc="Uploading people"):
-        batch = candidates[i : i + SUPABASE_BATCH_SIZE]
-        records = []
-        for c in batch:
-            r = _candidate_to_record(c)
-            r["last_verified_at"] = c.last_verified_at or datetime.now(timezone.utc).isoformat()
-            records.append(r)
+    log.info(f"Uploading {len(candidates)} people to Supabase ({loader} loader)...")
+    identities = open_identity_index()
+    people = make_writer("people", loader)
+    claims: dict[str, dict] = {}
+    skipped = 0
+    for c in tqdm(candidates, desc="Uploading people"):
+        record = _people_record(c)
+        if _claimed_elsewhere(c, record, identities):
+            skipped += 1
+            continue
+        people.add(record, key=c.qid)
+        claims[c.qid] = _identity_claim(record)
+    try:
+        people.close()
+    finally:
+        # Rows that landed before a failure are still claimed
+        _claim_written(claims, people.written, identities)
+        identities.close()
+    log.info(f"Skipped {skipped} people already created by another source")
 
-        try:
-            resp = requests.post(
-                people_url, json=records, headers=headers, timeout=30
-            )
-            if resp.status_code in (200, 201):
-                success_count += len(batch)
-            else:
-                log.error(f"Supabase people insert failed ({resp.status_code}): {resp.text[:300]}")
-                error_count += len(batch)
-        except Exception as e:
-            log.error(f"Supabase people insert error: {e}")
-            error_count += len(batch)
+    log.info(f"Uploading {len(audit_log)} audit entries...")
+    audit = make_writer("audit_log", loader)
+    for entry in audit_log:
+        audit.add(_audit_record(entry))
+    audit.close()
 
-        time.sleep(0.2)
+    log.info("Supabase upload complete.")
+    return people.written
+
+
+def _people_record(c: Candidate) -> dict:
+    r = _candidate_to_record(c)
+    r["last_verified_at"] = c.last_verified_at or datetime.now(timezone.utc).isoformat()
+    return r
+
+
+def open_identity_index() -> IdentityIndex:
+    """Open the identity index shared with the scraper and influencer import, synced if possible."""
+    identities = IdentityIndex(supabase_url=SUPABASE_URL, supabase_key=SUPABASE_KEY)
+    try:
+        n = identities.sync()
+        log.info(f"Identity index: {len(identities)} people ({n} rows synced)")
+    except (requests.RequestException, RuntimeError) as e:
+        log.warning(f"Identity index sync failed, using the local copy: {e}")
+    return identities
+
+
+def _claimed_elsewhere(c: Candidate, record: dict, identities: IdentityIndex) -> bool:
+    """True when another writer already created this person under a different row.
+
+    A QID match is this pipeline's own row and is upserted as usual. A
+    match on the name alone (the other row has no QID, e.g. a scraped or
+    CSV-imported creator) is logged as a warning, since that is the one
+    case where two different people could be conflated. Nothing is
+    claimed here: `_claim_written` files the keys once the row has landed.
+    """
+    match = identities.lookup(record)
+    if match is None or match.kind == "qid":
+        return False
+    if match.kind == "name":
+        log.warning(
+            f"  Skipping {c.name} ({c.qid}): {match.person_id} has the same name "
+            f"and no QID; check whether they are the same person"
+        )
+    else:
+        log.debug(f"  {c.name} ({c.qid}) already exists as {match.person_id} ({match.kind} match)")
+    return True
 
-    log.info(f"People upload: {success_count} success, {error_count} errors")
 
-    # Upload audit log in batches
-    audit_url = f"{SUPABASE_URL}/rest/v1/audit_log"
-    log.info(f"Uploading {len(audit_log)} audit entries...")
+def _identity_claim(record: dict) -> dict:
+    """The fields of a people record that identity_keys reads."""
+    return {k: record.get(k) for k in ("wikidata_qid", "name", "platform_handles")}
 
-    for i in range(0, len(audit_log), SUPABASE_BATCH_SIZE):
-        batch = audit_log[i : i + SUPABASE_BATCH_SIZE]
-        records = []
-        for entry in batch:
-            r = asdict(entry)
-            r["created_at"] = r["created_at"] or datetime.now(timezone.utc).isoformat()
-            records.append(r)
 
-        try:
-            resp = requests.post(
-                audit_url, json=records, headers=headers, timeout=30
-            )
-            if resp.status_code not in (200, 201):
-                log.error(f"Supabase audit insert failed ({resp.status_code}): {resp.text[:200]}")
-        except Exception as e:
-            log.error(f"Supabase audit insert error: {e}")
+def _claim_written(claims: dict[str, dict], written: set[str], identities: IdentityIndex):
+    """Claim the identity keys of rows that were written, for the other writers.
 
-        time.sleep(0.1)
+    Rows that failed (dead-lettered or rolled back) stay unclaimed, so they
+    cannot block the scraper or influencer import from creating that person.
+    """
+    for qid in written:
+        claim = claims.get(qid)
+        if claim is not None:
+            identities.add(claim)
 
-    log.info("Supabase upload complete.")
+
+def upload_configured(loader: str) -> bool:
+    """Check the credentials `loader` needs, warning when the upload will be skipped."""
+    if loader == "copy":
+        if not DATABASE_URL:
+            log.warning("DATABASE_URL not set, skipping upload.")
+            return False
+        return True
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        log.warning("Supabase credentials not set, skipping upload.")
+        return False
+    return True
+
+
+def make_writer(table: str, loader: str = "rest") -> "RowWriter":
+    """Return a row writer for `table`: batched PostgREST POSTs, or COPY for reseeds."""
+    if loader == "copy":
+        if table == "people":
+            return CopyLoader(DATABASE_URL, table, CSV_FIELDNAMES, conflict_column="wikidata_qid")
+        return CopyLoader(DATABASE_URL, table, AUDIT_FIELDNAMES)
+    return SupabaseBatchWriter(table)
+
+
+class SupabaseBatchWriter:
+    """Buffer rows for one PostgREST table and POST them in concurrent batches.
+
+    `add` flushes automatically once the batch reaches its current size or
+    SUPABASE_MAX_PAYLOAD_BYTES, so callers can feed it from a stream;
+    `close` flushes the remainder and waits for in-flight batches. Batch
+    size grows while POSTs are faster than SUPABASE_TARGET_LATENCY and
+    shrinks when they are slower. Failed batches are retried with jittered
+    exponential backoff; a batch rejected for its content (see
+    SUPABASE_SPLIT_STATUSES) is split in half to isolate bad rows, and rows
+    that still fail go to a dead-letter file that `replay_dead_letters` can
+    re-send. Any other client error (bad key, missing table, ...) cannot be
+    fixed by retrying: it and every later batch are dead-lettered without
+    being sent, and `close` raises so the run stops. Keys of written rows
+    are collected in `written`.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        batch_size: int = SUPABASE_BATCH_SIZE,
+        concurrency: int = SUPABASE_CONCURRENCY,
+    ):
+        self.table = table
+        self.url = f"{SUPABASE_URL}/rest/v1/{table}"
+        self.batch_size = batch_size
+        self.headers = {
+            "apikey": SUPABASE_KEY,
+            "Authorization": f"Bearer {SUPABASE_KEY}",
+            "Content-Type": "application/json",
+            "Prefer": "resolution=merge-duplicates",
+        }
+        self.dead_letter_path = OUTPUT_DIR / f"dead_letter_{table}.jsonl"
+        self.success_count = 0
+        self.error_count = 0
+        self.retry_count = 0
+        self.fatal: Optional[str] = None
+        self.written: set[str] = set()
+        self._records: list[dict] = []
+        self._keys: list[Optional[str]] = []
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._slots = threading.BoundedSemaphore(max(1, concurrency) * 2)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+
+    def add(self, record: dict, key: Optional[str] = None):
+        self._records.append(record)
+        self._keys.append(key)
+        self._bytes += len(json.dumps(record, ensure_ascii=False, default=str))
+        if len(self._records) >= self.batch_size or self._bytes >= SUPABASE_MAX_PAYLOAD_BYTES:
+            self.flush()
+
+    def flush(self):
+        if not self._records:
+            return
+        batch = list(zip(self._records, self._keys))
+        self._records, self._keys, self._bytes = [], [], 0
+        # Blocks when enough batches are queued, keeping memory bounded
+        self._slots.acquire()
+        future = self._pool.submit(self._send, batch)
+        future.add_done_callback(lambda _: self._slots.release())
+
+    def close(self):
+        self.flush()
+        self._pool.shutdown(wait=True)
+        log.info(
+            f"{self.table} upload: {self.success_count} success, "
+            f"{self.error_count} errors, {self.retry_count} retries"
+        )
+        if self.error_count:
+            log.warning(f"  Failed {self.table} rows written to {self.dead_letter_path}")
+        if self.fatal:
+            raise RuntimeError(f"Supabase rejected writes to {self.table} ({self.fatal}); check SUPABASE_URL/SUPABASE_KEY")
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    def _send(self, batch: list[tuple[dict, Optional[str]]]):
+        if self.fatal:
+            self._dead_letter(batch, self.fatal)
+            return
+        records = [r for r, _ in batch]
+        error = ""
+        for attempt in range(SUPABASE_MAX_RETRIES):
+            started = time.monotonic()
+            try:
+                resp = self._session().post(self.url, json=records, timeout=60)
+            except Exception as e:
+                error = str(e)
+            else:
+                if resp.status_code in (200, 201):
+                    self._adapt(time.monotonic() - started)
+                    with self._lock:
+                        self.success_count += len(batch)
+                        self.written.update(k for _, k in batch if k is not None)
+                    return
+                error = f"{resp.status_code}: {resp.text[:300]}"
+                if resp.status_code in SUPABASE_SPLIT_STATUSES:
+                    # Payload too large or a bad row: halve and retry each side on its own
+                    if len(batch) > 1:
+                        if resp.status_code == 413:
+                            self._adapt(SUPABASE_TARGET_LATENCY * 2)
+                        mid = len(batch) // 2
+                        self._send(batch[:mid])
+                        self._send(batch[mid:])
+                        return
+                    break
+                if 400 <= resp.status_code < 500 and resp.status_code not in (408, 429):
+                    # Auth or config problem: every batch will fail the same way
+                    log.error(f"Supabase {self.table} insert failed ({error}), not sending any more batches")
+                    with self._lock:
+                        self.fatal = self.fatal or error
+                    self._dead_letter(batch, error)
+                    return
+            log.warning(f"Supabase {self.table} batch failed ({error}), attempt {attempt + 1}/{SUPABASE_MAX_RETRIES}")
+            with self._lock:
+                self.retry_count += 1
+            time.sleep(min(60, 2 ** attempt) * random.uniform(0.5, 1.5))
+
+        log.error(f"Supabase {self.table} insert gave up on {len(batch)} rows: {error}")
+        self._dead_letter(batch, error)
+
+    def _adapt(self, latency: float):
+        """Grow the batch size while POSTs are fast; halve it when they are slow."""
+        with self._lock:
+            if latency < SUPABASE_TARGET_LATENCY / 2:
+                self.batch_size = min(SUPABASE_MAX_BATCH_SIZE, int(self.batch_size * 1.5) + 1)
+            elif latency > SUPABASE_TARGET_LATENCY:
+                self.batch_size = max(SUPABASE_MIN_BATCH_SIZE, self.batch_size // 2)
+
+    def _dead_letter(self, batch: list[tuple[dict, Optional[str]]], error: str):
+        failed_at = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self.error_count += len(batch)
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                for record, key in batch:
+                    f.write(json.dumps({
+                        "table": self.table,
+                        "key": key,
+                        "record": record,
+                        "error": error,
+                        "failed_at": failed_at,
+                    }, ensure_ascii=False, default=str) + "\n")
+
+
+RowWriter = Union[SupabaseBatchWriter, CopyLoader]
+
+
+def replay_dead_letters() -> set[str]:
+    """Re-send every dead-lettered row; rows that fail again are dead-lettered anew.
+
+    People rows that land are claimed in the identity index, as on upload.
+    """
+    written: set[str] = set()
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        log.warning("Supabase credentials not set, cannot replay dead letters.")
+        return written
+    for path in sorted(OUTPUT_DIR.glob("dead_letter_*.jsonl")):
+        replaying = path.with_suffix(".replaying")
+        path.replace(replaying)
+        writer = None
+        claims: dict[str, dict] = {}
+        with open(replaying, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if writer is None:
+                    writer = SupabaseBatchWriter(entry["table"])
+                    log.info(f"Replaying dead letters for {entry['table']} from {path}")
+                writer.add(entry["record"], key=entry.get("key"))
+                if entry["table"] == "people" and entry.get("key"):
+                    claims[entry["key"]] = _identity_claim(entry["record"])
+        try:
+            if writer:
+                try:
+                    writer.close()
+                finally:
+                    written |= writer.written
+                    if claims:
+                        identities = open_identity_index()
+                        _claim_written(claims, writer.written, identities)
+                        identities.close()
+        finally:
+            # Rows that failed again are back in the dead-letter file by now
+            replaying.unlink()
+    return written
+
+
+# ── Utility: Rate Limiting ───────────────────────────────────────────
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by concurrent API workers."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = max(rate, 0.01)
+        self.capacity = burst if burst is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit shared by workers hitting a throttling API.
+
+    Used as a context manager around each request. The limit grows by one
+    after `limit` consecutive successes and halves on every 429 or timeout;
+    a Retry-After pause blocks all workers until it expires.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = self.max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def wait_if_paused(self):
+        with self._cond:
+            wait = self._paused_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._cond:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+
+    def on_throttled(self, retry_after: float):
+        with self._cond:
+            self.limit = max(self.min_limit, self.limit // 2)
+            self._successes = 0
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        log.info(f"  Throttled — concurrency now {self.limit}")
 
 
 # ── Utility: Candidate Serialization ─────────────────────────────────
 
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
 
-def _save_candidates(candidates: list[Candidate], path: Path):
+def _save_candidates(candidates: Iterable[Candidate], path: Path):
     """Save candidates to a JSONL cache file."""
     with open(path, "w", encoding="utf-8") as f:
         for c in candidates:
-            f.write(json.dumps(asdict(c), ensure_ascii=False) + "\n")
+            f.write(_candidate_line(c))
+
+
+def _candidate_line(c: Candidate) -> str:
+    # Same bytes as json.dumps(asdict(c), ensure_ascii=False), without the deep copy
+    return _JSON_ENCODER.encode(dict(zip(CANDIDATE_FIELDS, _candidate_values(c)))) + "\n"
 
 
 def _load_candidates(path: Path) -> list[Candidate]:
-    """Load candidates from a JSONL cache file."""
-    candidates = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                data = json.loads(line)
-                candidates.append(Candidate(**data))
-    return candidates
+    """Load candidates from a cache file."""
+    with _gc_paused():
+        return list(_iter_candidates(path))
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic GC while building many acyclic objects at once.
+
+    GC passes over a fast-growing heap of candidates or audit entries would
+    otherwise take longer than creating them.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _iter_candidates(path: Path) -> Iterator[Candidate]:
+    """Stream candidates from a cache file in any checkpoint codec (picked by suffix)."""
+    codec = codec_for(path)
+    if hasattr(codec, "read_rows"):
+        fields, rows = codec.read_rows(path)
+        with rows:
+            if tuple(fields) == CANDIDATE_FIELDS:
+                positions = [CANDIDATE_FIELDS.index(name) for name in INTERNED_FIELDS]
+                for row in rows:
+                    for i in positions:
+                        row[i] = sys.intern(row[i])
+                    yield Candidate(*row)
+                return
+    for data in codec.read(path):
+        for name in INTERNED_FIELDS:
+            if name in data:
+                data[name] = sys.intern(data[name])
+        yield Candidate(**data)
+
+
+def _readable(path: Path) -> bool:
+    """Whether a codec for `path` is installed (msgpack checkpoints need msgpack)."""
+    try:
+        codec_for(path)
+    except (RuntimeError, ValueError):
+        return False
+    return True
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+# ── Utility: Stage Checkpoints ───────────────────────────────────────
+#
+# Every stage's checkpoint is keyed on a hash of the stage config plus the
+# digest of its input (the previous stage's output), recorded in
+# _intermediate/manifest.json. Changing a config constant, or anything
+# upstream, changes the key and forces that stage and everything after it
+# to recompute. Audit entries are saved next to the stage that made them.
+# Checkpoints are written with the manager's codec (see checkpoint_codec);
+# the digest is always taken over the JSONL form, so switching codecs never
+# invalidates a checkpoint, and one written by another codec is still read.
+
+STAGE_FILES = {  # the checkpoint codec adds the suffix
+    "raw": "candidates_raw",
+    "headshots": "candidates_with_headshots",
+    "filtered": "candidates_filtered",
+    "deduped": "candidates_deduped",
+}
+DEFAULT_CHECKPOINT_FORMAT = "msgpack" if "msgpack" in available_codecs() else "jsonl"
+
+
+@dataclass
+class Stage:
+    name: str
+    key: str
+    path: Path
+    input: str = ""  # digest of the upstream output the key was derived from
+
+    @property
+    def audit_path(self) -> Path:
+        return self.path.with_suffix(".audit.jsonl")
+
+
+def digest_candidates(candidates: Iterable[Candidate]) -> str:
+    """Hash candidates exactly as they are serialized into a checkpoint."""
+    h = hashlib.sha256()
+    for c in candidates:
+        h.update(_candidate_line(c).encode("utf-8"))
+    return h.hexdigest()
+
+
+class CheckpointManager:
+    """Content-addressed stage checkpoints under one directory."""
+
+    def __init__(self, directory: Path, codec: str = DEFAULT_CHECKPOINT_FORMAT):
+        self.directory = directory
+        self.codec = get_codec(codec)
+        self.manifest_path = directory / "manifest.json"
+        self.manifest: dict[str, dict] = {}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self._fresh: set[str] = set()  # stages known valid during this run
+        self._partial: set[str] = set()  # digests of outputs left uncommitted this run
+
+    def stage(self, name: str, config: dict, input_digest: str = "") -> Stage:
+        payload = json.dumps(
+            {"stage": name, "config": config, "input": input_digest},
+            sort_keys=True, default=str,
+        )
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        entry = self.manifest.get(name)
+        if entry and entry["key"] == key:
+            return Stage(name, key, self.directory / entry["file"], input_digest)
+        return Stage(name, key, self._path(name), input_digest)
+
+    def use_codec(self, name: str):
+        self.codec = get_codec(name)
+
+    def _path(self, name: str) -> Path:
+        """Where stage `name` is written with the current codec."""
+        return self.directory / (STAGE_FILES[name] + self.codec.suffix)
+
+    def saved_path(self, name: str) -> Path:
+        """The file holding stage `name`'s last committed checkpoint."""
+        return self.directory / self.manifest[name]["file"]
+
+    def is_valid(self, stage: Stage) -> bool:
+        entry = self.manifest.get(stage.name)
+        return bool(
+            entry and entry["key"] == stage.key and stage.path.exists()
+            and _readable(stage.path)
+        )
+
+    def load(self, stage: Stage, audit_log=None) -> Optional[list[Candidate]]:
+        """Return the stage's candidates (replaying its audit entries) if still valid."""
+        if not self.is_valid(stage):
+            return None
+        if audit_log is not None:
+            for entry in self._iter_audit(stage):
+                audit_log.append(entry)
+        self._fresh.add(stage.name)
+        return _load_candidates(stage.path)
+
+    def save(
+        self,
+        stage: Stage,
+        candidates: list[Candidate],
+        audit: Optional[list[AuditEntry]] = None,
+        failures: Sequence[str] = (),
+    ):
+        """Commit the stage's output, unless it is incomplete.
+
+        An output is incomplete when its producer reported `failures` or
+        its input was itself an incomplete output. It is then left
+        uncommitted, and its digest is remembered so the stages built on it
+        are not committed either; otherwise a later run whose upstream
+        fails the same way would replay them as if they were whole.
+        """
+        if failures or stage.input in self._partial:
+            self._partial.add(digest_candidates(candidates))
+            reason = f"{len(failures)} of its inputs failed" if failures else "its input is incomplete"
+            log.warning(f"Not saving the {stage.name} checkpoint: {reason}, rerun to retry them")
+            return
+        with self._writer(stage) as write:
+            for c in candidates:
+                write(c)
+        if audit is not None:
+            self._save_audit(stage, audit)
+
+    def stream(
+        self,
+        name: str,
+        config: dict,
+        upstream: Optional[str],
+        produce: Callable[..., Iterable[Candidate]],
+        audit_log=None,
+        complete: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[Candidate]:
+        """Replay a valid checkpoint, or run the stage and tee it to disk.
+
+        Call stages in pipeline order: the decision is made immediately, and
+        a stage can only be replayed when its upstream was replayed too (its
+        key depends on the upstream output digest). On a replay the saved
+        audit entries go to `audit_log` right away and `produce` is never
+        called, so upstream work is skipped entirely.
+
+        A produced stage is only committed when `complete()` (if given)
+        returns true once it finishes and its upstream was committed, so a
+        partial output is never replayed as if it were whole.
+        """
+        if upstream is None or upstream in self._fresh:
+            digest = self.manifest[upstream]["digest"] if upstream else ""
+            stage = self.stage(name, config, digest)
+            if self.is_valid(stage):
+                log.info(f"Replaying cached stage output from {stage.path}")
+                self._fresh.add(name)
+                if audit_log is not None:
+                    for entry in self._iter_audit(stage):
+                        audit_log.append(entry)
+                return _iter_candidates(stage.path)
+        return self._produce(name, config, upstream, produce, audit_log, complete)
+
+    def _produce(self, name, config, upstream, produce, audit_log, complete) -> Iterator[Candidate]:
+        def current() -> Optional[Stage]:
+            if (upstream and upstream not in self.manifest) or (complete and not complete()):
+                return None
+            digest = self.manifest[upstream]["digest"] if upstream else ""
+            return self.stage(name, config, digest)
+
+        def key() -> Optional[str]:
+            stage = current()
+            return stage.key if stage else None
+
+        stage_audit: list[AuditEntry] = []
+        tee = _AuditTee(audit_log, stage_audit) if audit_log is not None else None
+        with self._writer(Stage(name, "", self._path(name)), key_fn=key) as write:
+            for c in produce() if tee is None else produce(tee):
+                write(c)
+                yield c
+        stage = current()
+        if audit_log is not None and stage:
+            self._save_audit(stage, stage_audit)
+
+    def _writer(self, stage: Stage, key_fn: Optional[Callable[[], Optional[str]]] = None):
+        # Always write with the current codec, even over a checkpoint from another one
+        stage = Stage(stage.name, stage.key, self._path(stage.name))
+        return _CheckpointWriter(self, stage, key_fn)
+
+    def _commit(self, stage: Stage, key: str, digest: str, count: int):
+        self.manifest[stage.name] = {
+            "key": key,
+            "digest": digest,
+            "count": count,
+            "file": stage.path.name,
+            "codec": self.codec.name,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._fresh.add(stage.name)
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        tmp.replace(self.manifest_path)
+
+    def _save_audit(self, stage: Stage, audit: list[AuditEntry]):
+        with open(stage.audit_path, "w", encoding="utf-8") as f:
+            for entry in audit:
+                f.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+
+    def _iter_audit(self, stage: Stage) -> Iterator[AuditEntry]:
+        if not stage.audit_path.exists():
+            return
+        with open(stage.audit_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield AuditEntry(**json.loads(line))
+
+
+class _CheckpointWriter:
+    """Writes a stage to a temp file, hashing as it goes; commits on clean exit."""
+
+    def __init__(self, manager: CheckpointManager, stage: Stage, key_fn=None):
+        self.manager = manager
+        self.stage = stage
+        self.key_fn = key_fn or (lambda: stage.key)
+        self.tmp = stage.path.with_suffix(stage.path.suffix + ".tmp")
+        self.hash = hashlib.sha256()
+        self.count = 0
+
+    def __enter__(self):
+        old = self.manager.manifest.pop(self.stage.name, None)
+        self.replaces = old and old["file"] != self.stage.path.name and old["file"]
+        self._out = self.manager.codec.open_writer(self.tmp, CANDIDATE_FIELDS)
+        return self.write
+
+    def write(self, c: Candidate):
+        line = _candidate_line(c)
+        self._out.write(_candidate_values(c), line)
+        self.hash.update(line.encode("utf-8"))
+        self.count += 1
+
+    def __exit__(self, exc_type, *exc):
+        self._out.close()
+        if exc_type is not None:
+            return False
+        key = self.key_fn()
+        if key is None:
+            self.tmp.unlink(missing_ok=True)
+            log.warning(f"Not saving the {self.stage.name} checkpoint: the stage is incomplete")
+            return False
+        self.tmp.replace(self.stage.path)
+        if self.replaces:  # written by another codec last time
+            (self.manager.directory / self.replaces).unlink(missing_ok=True)
+        self.manager._commit(self.stage, key, self.hash.hexdigest(), self.count)
+        return False
+
+
+class _AuditTee:
+    """Forwards audit entries to the run's sink and keeps a per-stage copy."""
+
+    def __init__(self, sink, stage_audit: list[AuditEntry]):
+        self.sink = sink
+        self.stage_audit = stage_audit
+
+    def append(self, entry: AuditEntry):
+        self.sink.append(entry)
+        self.stage_audit.append(entry)
+
+
+CHECKPOINTS = CheckpointManager(INTERMEDIATE_DIR)
 
 
 # ── QA Checks ────────────────────────────────────────────────────────
 
 
-def run_qa_checks(candidates: list[Candidate], audit_log: list[AuditEntry]):
-    """Run quality assurance checks on the final dataset."""
+def run_qa_checks(candidates: Iterable[Candidate], audit_log: list[AuditEntry]):
+    """Run quality assurance checks on the final dataset (single pass)."""
     log.info("=" * 60)
     log.info("QA CHECKS")
     log.info("=" * 60)
 
-    # Check 1: All records have required fields
     missing_fields = 0
+    minors = 0
+    cat_counts: dict[str, int] = {}
     for c in candidates:
         if not all([c.name, c.profession, c.headshot_url, c.headshot_source,
                      c.headshot_license, c.headshot_attribution]):
             missing_fields += 1
+        if c.birth_year and c.birth_year > MIN_BIRTH_YEAR_FOR_ADULT:
+            minors += 1
+        cat_counts[c.category] = cat_counts.get(c.category, 0) + 1
+
+    # Check 1: All records have required fields
     status = "PASS" if missing_fields == 0 else "FAIL"
     log.info(f"  [{status}] All records have required fields ({missing_fields} missing)")
 
     # Check 2: No minors
-    minors = [c for c in candidates if c.birth_year and c.birth_year > MIN_BIRTH_YEAR_FOR_ADULT]
-    status = "PASS" if len(minors) == 0 else "FAIL"
-    log.info(f"  [{status}] No minors in public seed ({len(minors)} found)")
+    status = "PASS" if minors == 0 else "FAIL"
+    log.info(f"  [{status}] No minors in public seed ({minors} found)")
 
     # Check 3: Audit log present
     status = "PASS" if len(audit_log) > 0 else "FAIL"
@@ -949,10 +2102,6 @@ def run_qa_checks(candidates: list[Candidate], audit_log: list[AuditEntry]):
     # Category breakdown
     log.info("")
     log.info("CATEGORY BREAKDOWN:")
-    cat_counts: dict[str, int] = {}
-    for c in candidates:
-        cat_counts[c.category] = cat_counts.get(c.category, 0) + 1
-
     total = 0
     for cat, config in CATEGORY_CONFIG.items():
         count = cat_counts.get(cat, 0)
@@ -967,31 +2116,299 @@ def run_qa_checks(candidates: list[Candidate], audit_log: list[AuditEntry]):
     log.info("=" * 60)
 
 
+# ── Incremental Runs ─────────────────────────────────────────────────
+#
+# Each run stores the resolved candidates (with their Wikidata revision)
+# and a hash of every record uploaded to Supabase. With --incremental,
+# only candidates whose revision changed are sent back to Commons, and
+# only records whose hash changed are uploaded.
+
+
+def load_snapshot() -> dict[str, Candidate]:
+    """Load the previous run's resolved candidates, keyed by QID."""
+    path = STATE_DIR / "resolved_snapshot.jsonl"
+    if not path.exists():
+        return {}
+    return {c.qid: c for c in _load_candidates(path)}
+
+
+def save_snapshot(candidates: Iterable[Candidate]):
+    STATE_DIR.mkdir(exist_ok=True)
+    _save_candidates(candidates, STATE_DIR / "resolved_snapshot.jsonl")
+
+
+def split_changed(
+    candidates: list[Candidate], snapshot: dict[str, Candidate]
+) -> tuple[list[Candidate], dict[str, Candidate]]:
+    """Split fresh candidates into (changed, unchanged-from-snapshot).
+
+    A candidate is unchanged when the snapshot holds the same QID at the
+    same revision; the snapshot copy (with its resolved headshot) is kept.
+    """
+    changed = []
+    unchanged = {}
+    for c in candidates:
+        prev = snapshot.get(c.qid)
+        if prev and c.revision and prev.revision == c.revision:
+            prev.category = c.category
+            prev.profession = c.profession
+            unchanged[c.qid] = prev
+        else:
+            changed.append(c)
+    return changed, unchanged
+
+
+def _record_hash(c: Candidate) -> str:
+    record = _candidate_to_record(c)
+    record.pop("last_verified_at", None)
+    return hashlib.sha256(
+        json.dumps(record, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def load_uploaded_hashes() -> dict[str, str]:
+    path = STATE_DIR / "uploaded_hashes.json"
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_uploaded_hashes(hashes: dict[str, str]):
+    STATE_DIR.mkdir(exist_ok=True)
+    tmp = STATE_DIR / "uploaded_hashes.json.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(hashes, f)
+    tmp.replace(STATE_DIR / "uploaded_hashes.json")
+
+
+# ── Streaming Runs ───────────────────────────────────────────────────
+#
+# With --stream the stages are chained as generators: headshot batches
+# start as soon as the first discovery query returns, and Supabase batches
+# are posted while discovery is still running. Each stage still tees its
+# output to the usual _intermediate checkpoint.
+
+
+class AuditSink:
+    """Streams audit entries to the JSONL export and (optionally) Supabase."""
+
+    def __init__(self, path: Path, writer: Optional[RowWriter] = None):
+        self._file = open(path, "w", encoding="utf-8")
+        self.path = path
+        self.writer = writer
+        self.count = 0
+
+    def append(self, entry: AuditEntry):
+        record = _audit_record(entry)
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if self.writer:
+            self.writer.add(record)
+        self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self):
+        self._file.close()
+        if self.writer:
+            self.writer.close()
+        log.info(f"Exported {self.count} audit entries to {self.path}")
+
+
+def run_streaming(args: argparse.Namespace) -> tuple[int, int]:
+    """Run every stage as one generator chain; return (people, audit entries)."""
+    upload = upload_configured(args.loader)
+    people = make_writer("people", args.loader) if upload else None
+    identities = open_identity_index() if upload else None
+    audit_log = AuditSink(
+        OUTPUT_DIR / "audit_log.jsonl",
+        make_writer("audit_log", args.loader) if upload else None,
+    )
+
+    discovery_failures: list[str] = []
+    raw = CHECKPOINTS.stream(
+        "raw", discovery_config(), None,
+        lambda: iter_discovered(args.sparql_concurrency, discovery_failures),
+        complete=lambda: not discovery_failures,
+    )
+    headshot_failures: list[str] = []
+    resolved = CHECKPOINTS.stream(
+        "headshots", HEADSHOT_CONFIG, "raw",
+        lambda: iter_resolved(raw, args.concurrency, args.rps, headshot_failures),
+        complete=lambda: not headshot_failures,
+    )
+    safe = CHECKPOINTS.stream(
+        "filtered", safety_config(), "headshots",
+        lambda sink: iter_safe(resolved, sink),
+        audit_log=audit_log,
+    )
+    deduped = CHECKPOINTS.stream(
+        "deduped", {**DEDUP_CONFIG, "streaming": True}, "filtered",
+        lambda: iter_deduped(safe),
+    )
+
+    count = 0
+    hashes: dict[str, str] = {}
+    claims: dict[str, dict] = {}
+    jsonl_path = OUTPUT_DIR / "people_seed_v1.jsonl"
+    csv_path = OUTPUT_DIR / "people_seed_v1.csv"
+    with open(jsonl_path, "w", encoding="utf-8") as jf, \
+            open(csv_path, "w", newline="", encoding="utf-8") as cf:
+        writer = csv.DictWriter(cf, fieldnames=CSV_FIELDNAMES)
+        writer.writeheader()
+        for c in tqdm(deduped, desc="Streaming people"):
+            jf.write(json.dumps(_candidate_to_record(c), ensure_ascii=False) + "\n")
+            writer.writerow(_csv_row(c))
+            if people:
+                record = _people_record(c)
+                if not _claimed_elsewhere(c, record, identities):
+                    people.add(record, key=c.qid)
+                    hashes[c.qid] = _record_hash(c)
+                    claims[c.qid] = _identity_claim(record)
+            count += 1
+    log.info(f"Exported {count} records to {jsonl_path} and {csv_path}")
+
+    if people:
+        try:
+            people.close()
+        finally:
+            _claim_written(claims, people.written, identities)
+            identities.close()
+        uploaded_hashes = load_uploaded_hashes()
+        uploaded_hashes.update({qid: hashes[qid] for qid in people.written})
+        save_uploaded_hashes(uploaded_hashes)
+    audit_log.close()
+    if discovery_failures or headshot_failures:
+        log.warning(
+            f"{len(discovery_failures)} discovery chunks and {len(headshot_failures)} "
+            f"Commons lookups failed; stage checkpoints, snapshot and QA checks "
+            f"skipped, rerun to retry them"
+        )
+        return count, len(audit_log)
+    save_snapshot(_iter_candidates(CHECKPOINTS.saved_path("headshots")))
+
+    log.info("\n── QA Checks ──")
+    run_qa_checks(_iter_candidates(CHECKPOINTS.saved_path("deduped")), audit_log)
+    return count, len(audit_log)
+
+
 # ── Main Pipeline ────────────────────────────────────────────────────
 
 
-def main():
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed People DB pipeline")
+    parser.add_argument(
+        "--concurrency", type=int, default=COMMONS_CONCURRENCY,
+        help=f"Concurrent Commons requests (default {COMMONS_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--rps", type=float, default=COMMONS_REQUESTS_PER_SECOND,
+        help=f"Max Commons requests per second (default {COMMONS_REQUESTS_PER_SECOND:g})",
+    )
+    parser.add_argument(
+        "--sparql-concurrency", type=int, default=SPARQL_CONCURRENCY,
+        help=f"Max parallel Wikidata SPARQL queries (default {SPARQL_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Re-resolve and upload only people whose Wikidata revision changed",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Stream candidates through all stages instead of materializing each one",
+    )
+    parser.add_argument(
+        "--loader", choices=("rest", "copy"), default="rest",
+        help="Upload via batched PostgREST upserts (default) or Postgres COPY "
+             "over DATABASE_URL, which is much faster for full reseeds",
+    )
+    parser.add_argument(
+        "--checkpoint-format", choices=("jsonl", "msgpack"), default=DEFAULT_CHECKPOINT_FORMAT,
+        help="Codec for _intermediate/ stage checkpoints: msgpack (+zstd when installed) "
+             f"restarts much faster; JSONL stays human-readable (default {DEFAULT_CHECKPOINT_FORMAT})",
+    )
+    parser.add_argument(
+        "--replay-dead-letters", action="store_true",
+        help="Only re-send rows from output/dead_letter_*.jsonl, then exit",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Bypass the on-disk HTTP response cache",
+    )
+    args = parser.parse_args(argv)
+    if args.stream and args.incremental:
+        parser.error("--stream and --incremental cannot be combined")
+    if args.loader == "copy" and importlib.util.find_spec("psycopg") is None:
+        parser.error('--loader copy needs psycopg 3: pip install "psycopg[binary]"')
+    if args.checkpoint_format not in available_codecs():
+        parser.error("--checkpoint-format msgpack needs msgpack: pip install msgpack zstandard")
+    return args
+
+
+def main(argv: Optional[list[str]] = None):
+    args = parse_args(argv)
+    HTTP_CACHE.enabled = not args.no_cache
+    CHECKPOINTS.use_codec(args.checkpoint_format)
     log.info("=" * 60)
     log.info("SEED PEOPLE DB v1 — Gen Z Public Figures Pipeline")
     log.info("=" * 60)
     start_time = time.time()
     audit_log: list[AuditEntry] = []
 
+    if args.replay_dead_letters:
+        replay_dead_letters()
+        return
+
+    if args.stream:
+        count, audit_count = run_streaming(args)
+        elapsed = time.time() - start_time
+        log.info(f"\nPipeline complete in {elapsed:.1f}s ({elapsed / 60:.1f} min)")
+        log.info(f"HTTP cache: {HTTP_CACHE.stats()}")
+        log.info(f"Final dataset: {count} people")
+        log.info(f"Audit log: {audit_count} entries")
+        log.info(f"Output: {OUTPUT_DIR}")
+        return
+
+    incremental = args.incremental
+    if incremental:
+        # Discovery must see current revisions, so never serve SPARQL from cache
+        HTTP_CACHE.ttls[WIKIDATA_SPARQL_URL] = 0
+
     # Step 1: Candidate Discovery
     log.info("\n── Step 1: Candidate Discovery ──")
-    candidates = discover_candidates()
+    candidates = discover_candidates(
+        concurrency=args.sparql_concurrency, refresh=incremental
+    )
 
     # Step 2: Headshot Resolution
     log.info("\n── Step 2: Headshot Resolution ──")
-    candidates = resolve_headshots(candidates)
+    unchanged: dict[str, Candidate] = {}
+    if incremental:
+        changed, unchanged = split_changed(candidates, load_snapshot())
+        log.info(f"Incremental: {len(changed)} changed, {len(unchanged)} unchanged")
+        fresh = {c.qid: c for c in resolve_headshots(
+            changed, concurrency=args.concurrency,
+            requests_per_second=args.rps, refresh=True,
+        )}
+        candidates = [
+            unchanged.get(c.qid) or fresh[c.qid]
+            for c in candidates
+            if c.qid in unchanged or c.qid in fresh
+        ]
+    else:
+        candidates = resolve_headshots(
+            candidates, concurrency=args.concurrency, requests_per_second=args.rps
+        )
+    save_snapshot(candidates)
 
-    # Step 3: Safety Filtering
+    # Step 3: Safety Filtering (cheap and age-dependent, so always the full set)
     log.info("\n── Step 3: Safety Filtering ──")
-    candidates = apply_safety_filters(candidates, audit_log)
+    candidates = apply_safety_filters(candidates, audit_log, refresh=incremental)
 
     # Step 4: Deduplication
     log.info("\n── Step 4: Deduplication ──")
-    candidates = deduplicate(candidates)
+    candidates = deduplicate(candidates, refresh=incremental)
 
     # Step 5: Export to files
     log.info("\n── Step 5: Export ──")
@@ -1001,7 +2418,20 @@ def main():
 
     # Step 6: Upload to Supabase
     log.info("\n── Step 6: Supabase Upload ──")
-    upload_to_supabase(candidates, audit_log)
+    uploaded_hashes = load_uploaded_hashes()
+    hashes = {c.qid: _record_hash(c) for c in candidates}
+    to_upload = candidates
+    audit_to_upload = audit_log
+    if incremental:
+        to_upload = [c for c in candidates if uploaded_hashes.get(c.qid) != hashes[c.qid]]
+        changed_qids = {c.qid for c in to_upload} | {
+            e.person_qid for e in audit_log if e.person_qid not in unchanged
+        }
+        audit_to_upload = [e for e in audit_log if e.person_qid in changed_qids]
+        log.info(f"Incremental: uploading {len(to_upload)} changed people")
+    uploaded = upload_to_supabase(to_upload, audit_to_upload, loader=args.loader)
+    uploaded_hashes.update({qid: hashes[qid] for qid in uploaded})
+    save_uploaded_hashes(uploaded_hashes)
 
     # QA Checks
     log.info("\n── QA Checks ──")
@@ -1009,6 +2439,7 @@ def main():
 
     elapsed = time.time() - start_time
     log.info(f"\nPipeline complete in {elapsed:.1f}s ({elapsed / 60:.1f} min)")
+    log.info(f"HTTP cache: {HTTP_CACHE.stats()}")
     log.info(f"Final dataset: {len(candidates)} people")
     log.info(f"Audit log: {len(audit_log)} entries")
     log.info(f"Output: {OUTPUT_DIR}")
@@ -8,11 +8,15 @@ and inserts them into the mogged.chat Supabase database.
 Runs indefinitely in the background.
 
 Usage:
-  python3 tiktok_scraper.py
+  python3 tiktok_scraper.py [--workers N] [--rate VISITS_PER_MIN]
+  python3 tiktok_scraper.py --replay-dead-letters   # re-send rows that failed to insert
 """
 
-import asyncio, os, re, sys, json, time, uuid, random, requests
-from datetime import datetime, timezone
+import argparse, asyncio, atexit, hashlib, logging, math, mmap, os, queue, re, signal, sys, json, struct, time, uuid, random, sqlite3, requests
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
+from datetime import datetime, timedelta, timezone
+
+from identity_index import IdentityIndex
 
 # ─── Env ─────────────────────────────────────────────────
 def _env(path):
@@ -39,8 +43,44 @@ HEADERS = {
 
 # ─── Config ──────────────────────────────────────────────
 MIN_FOLLOWERS = 250_000
-STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper_state.json")
-LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper.log")
+STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper_state.json")  # legacy, imported once
+FRONTIER_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper_frontier.sqlite")
+SEEN_FILTER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper_seen.bloom")
+SEEN_CAPACITY = 5_000_000   # handles before the filter is rebuilt at double size (~6 MB at 1%)
+SEEN_ERROR_RATE = 0.01
+LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper.jsonl")
+LOG_MAX_BYTES = 20 * 1024 * 1024
+LOG_BACKUPS = 5
+LOG_BUFFER_RECORDS = 50   # file writes are batched; WARNING and above flush at once
+METRICS_PORT = 9464       # Prometheus text endpoint on 127.0.0.1; 0 disables
+METRICS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper_metrics.json")
+METRICS_SNAPSHOT_INTERVAL = 60
+
+WORKERS = 3               # browser contexts visiting profiles in parallel
+VISITS_PER_MINUTE = 60    # hard cap across all workers; the pacer adapts below it
+CAPTCHA_PAUSE = 60        # first backoff for a challenged context, doubles per repeat
+CAPTCHA_MAX_PAUSE = 600
+VISIT_MAX_ATTEMPTS = 3    # failed visits (CAPTCHA, error, no data) before a handle is given up on
+VISIT_RETRY_DELAY = 300   # seconds before a failed handle is retried, doubles per repeat
+
+# Adaptive pacing per endpoint: (starting gap, floor, ceiling) in seconds
+# between requests across the whole pool
+PACING = {
+    "profile": (2.5, 1.0, 120.0),
+    "tag": (20.0, 5.0, 600.0),
+    "search": (20.0, 5.0, 600.0),
+}
+PACE_SPEEDUP = 0.9        # gap multiplier after a healthy response
+PACE_BACKOFF = 2.0        # gap multiplier after a CAPTCHA, timeout or empty result
+PACE_SLOW_LOAD = 8.0      # seconds; slower loads nudge the gap up instead of down
+PAGE_READY_TIMEOUT = 8000   # ms to wait for profile data / handle links to appear
+STATUS_INTERVAL = 60      # seconds between progress lines
+IDENTITY_SYNC_INTERVAL = 300  # seconds between delta syncs of the shared identity index
+WRITE_BATCH_SIZE = 25       # buffered inserts per bulk POST
+WRITE_FLUSH_INTERVAL = 15   # seconds; flush a partial batch at least this often
+WRITE_MAX_ATTEMPTS = 5      # failed flushes before rows go to the dead-letter file
+WRITE_SPLIT_STATUSES = (400, 409, 413, 422)  # row-level rejections: bisect instead of retrying
+DEAD_LETTER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scraper_dead_letter.jsonl")
 
 SEED_HANDLES = [
     "adinross", "clavicular", "hstikkytokky",
@@ -73,49 +113,512 @@ BRAINROT_KEYWORDS = [
 
 
 # ─── Logging ─────────────────────────────────────────────
-def log(msg):
-    ts = datetime.now(timezone.utc).strftime("%H:%M:%S")
-    line = f"[{ts}] {msg}"
-    print(line, flush=True)
-    try:
-        with open(LOG_FILE, "a") as f:
-            f.write(line + "\n")
-    except:
-        pass
+_logger = logging.getLogger("tiktok_scraper")
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, msg plus any per-event fields."""
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "msg": record.getMessage().strip(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(level="INFO"):
+    """Route log() through a queue to a console handler and a buffered, rotating JSONL file.
+
+    Formatting and file I/O happen on the listener thread, so the crawl loop
+    only pays for a queue put.
+    """
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", "%H:%M:%S"))
+    rotating = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+                                   encoding="utf-8", delay=True)
+    rotating.setFormatter(JsonLinesFormatter())
+    buffered = MemoryHandler(LOG_BUFFER_RECORDS, flushLevel=logging.WARNING, target=rotating)
+
+    q = queue.SimpleQueue()
+    listener = QueueListener(q, console, buffered, respect_handler_level=True)
+    _logger.handlers[:] = [QueueHandler(q)]
+    _logger.setLevel(level)
+    _logger.propagate = False
+    listener.start()
+
+    def stop():
+        listener.stop()
+        buffered.close()
+        rotating.close()
+    atexit.register(stop)
+
+
+def log(msg, level=logging.INFO, **fields):
+    """Log a line; keyword fields (handle, phase, latency_ms, outcome, ...) go to the JSONL file."""
+    _logger.log(level, msg, extra={"fields": fields})
+
+
+# ─── Metrics ─────────────────────────────────────────────
+class Metrics:
+    """Minimal in-process registry of labelled counters, gauges and histograms.
+
+    `render` emits the Prometheus text format served on /metrics; `snapshot`
+    adds derived rates (profiles/min, CAPTCHA, qualify and strategy hit
+    rates) for the periodic JSON dump.
+    """
+    BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.hists = {}
+        self.started = time.time()
+        self._last = (time.time(), 0)
+
+    def inc(self, name, n=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def set(self, name, value, **labels):
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        h = self.hists.setdefault(key, [[0] * len(self.BUCKETS), 0.0, 0])
+        for i, bound in enumerate(self.BUCKETS):
+            if seconds <= bound:
+                h[0][i] += 1
+        h[1] += seconds
+        h[2] += 1
+
+    def total(self, name, **match):
+        return sum(v for (n, labels), v in self.counters.items()
+                   if n == name and all(dict(labels).get(k) == str(val) for k, val in match.items()))
+
+    def render(self):
+        def fmt(labels, extra=()):
+            pairs = list(extra) + [(k, v) for k, v in labels]
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}" if pairs else ""
+        lines, typed = [], set()
+        for kind, series in (("counter", self.counters), ("gauge", self.gauges)):
+            for (name, labels), value in sorted(series.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} {kind}")
+                    typed.add(name)
+                lines.append(f"{name}{fmt(labels)} {value}")
+        for (name, labels), (buckets, total, count) in sorted(self.hists.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            for bound, n in zip(self.BUCKETS, buckets):
+                lines.append(f"{name}_bucket{fmt(labels, [('le', bound)])} {n}")
+            lines.append(f"{name}_bucket{fmt(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{fmt(labels)} {total:.3f}")
+            lines.append(f"{name}_count{fmt(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        now = time.time()
+        visits = self.total("scraper_profiles_total")
+        last_t, last_visits = self._last
+        self._last = (now, visits)
+        extracted = {dict(l).get("strategy"): v for (n, l), v in self.counters.items()
+                     if n == "scraper_extraction_total"}
+        hit = sum(v for k, v in extracted.items() if k != "none")
+        qualified = self.total("scraper_outcomes_total", outcome="queued") + \
+            self.total("scraper_outcomes_total", outcome="duplicate")
+        data_visits = qualified + self.total("scraper_outcomes_total", outcome="skipped")
+        latency = {}
+        for (name, labels), (_, total, count) in self.hists.items():
+            latency[name + fmt_labels(labels)] = round(total / count, 3) if count else None
+        return {
+            "ts": _now(),
+            "uptime_s": round(now - self.started),
+            "profiles_total": visits,
+            "profiles_per_min": round((visits - last_visits) / max(now - last_t, 1e-9) * 60, 2),
+            "captcha_rate": round(self.total("scraper_captcha_total") / max(visits, 1), 4),
+            "qualify_rate": round(qualified / max(data_visits, 1), 4),
+            "strategy_hit_rates": {k: round(v / max(hit, 1), 4) for k, v in extracted.items() if k != "none"},
+            "extraction_miss_rate": round(extracted.get("none", 0) / max(visits, 1), 4),
+            "mean_latency_s": latency,
+            "counters": {n + fmt_labels(l): v for (n, l), v in sorted(self.counters.items())},
+            "gauges": {n + fmt_labels(l): v for (n, l), v in sorted(self.gauges.items())},
+        }
+
+
+def fmt_labels(labels):
+    return "{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else ""
+
+
+METRICS = Metrics()
+
+
+async def serve_metrics(port):
+    """Serve METRICS.render() as text/plain on http://127.0.0.1:<port>/metrics."""
+    async def handle(reader, writer):
+        try:
+            request = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            path = request.split()[1].decode() if len(request.split()) > 1 else ""
+            if path.split("?")[0] == "/metrics":
+                body, status = METRICS.render().encode(), "200 OK"
+            else:
+                body, status = b"not found\n", "404 Not Found"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+    server = await asyncio.start_server(handle, "127.0.0.1", port)
+    log(f"  Metrics: http://127.0.0.1:{port}/metrics")
+    async with server:
+        await server.serve_forever()
+
+
+def write_metrics_snapshot(frontier):
+    METRICS.set("scraper_queue_length", len(frontier))
+    METRICS.set("scraper_visited_handles", frontier.visited_count())
+    tmp = METRICS_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(METRICS.snapshot(), f, indent=2)
+    os.replace(tmp, METRICS_FILE)
+
+
+async def snapshot_metrics(frontier):
+    while True:
+        await asyncio.sleep(METRICS_SNAPSHOT_INTERVAL)
+        write_metrics_snapshot(frontier)
+
+
+# ─── Crawl frontier ──────────────────────────────────────
+FRONTIER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS visited (
+    handle      TEXT PRIMARY KEY,
+    visited_at  TEXT NOT NULL,
+    source      TEXT
+);
+CREATE TABLE IF NOT EXISTS queue (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    handle      TEXT NOT NULL UNIQUE,
+    priority    REAL NOT NULL DEFAULT 0,
+    source      TEXT,
+    added_at    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_queue_order ON queue(priority DESC, seq);
+CREATE TABLE IF NOT EXISTS outcomes (
+    handle      TEXT PRIMARY KEY,
+    outcome     TEXT NOT NULL,          -- inserted | duplicate | skipped | failed
+    followers   INTEGER,
+    decided_at  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS retries (
+    handle      TEXT PRIMARY KEY,
+    attempts    INTEGER NOT NULL,
+    retry_at    TEXT NOT NULL         -- not popped again before this
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name        TEXT PRIMARY KEY,
+    value       INTEGER NOT NULL
+);
+"""
 
 
-# ─── State management ────────────────────────────────────
-def load_state():
-    if os.path.exists(STATE_FILE):
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def source_kind(source):
+    """Collapse a queue source ('#tag', 'search:q', '@parent', 'seed') to its kind."""
+    if not source:
+        return "unknown"
+    if source.startswith("#"):
+        return "hashtag"
+    if source.startswith("search:"):
+        return "search"
+    if source.startswith("@"):
+        return "suggestion"
+    return source
+
+
+class SeenFilter:
+    """Memory-mapped Bloom filter over every handle ever queued or visited.
+
+    A miss means the handle is definitely new, so the common case needs no
+    SQLite lookup; a hit is confirmed against the frontier tables, keeping
+    dedup exact. The bit array lives in a file, so memory stays flat and
+    restarts don't have to re-read the whole crawl history.
+    """
+    HEADER = struct.Struct("<4sQQQQ")  # magic, capacity, bits, hashes, count
+    MAGIC = b"SEEN"
+
+    def __init__(self, path, capacity=SEEN_CAPACITY, error_rate=SEEN_ERROR_RATE):
+        self.path = path
+        self.capacity = capacity
+        self.bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        size = self.HEADER.size + (self.bits + 7) // 8
+        self.fresh = not self._matches(path, capacity)
+        with open(path, "wb" if self.fresh else "r+b") as f:
+            if self.fresh:
+                f.truncate(size)
+                f.write(self.HEADER.pack(self.MAGIC, capacity, self.bits, self.hashes, 0))
+        self._file = open(path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        self.count = self.HEADER.unpack_from(self._mm)[4]
+
+    def _matches(self, path, capacity):
+        if not os.path.exists(path):
+            return False
+        with open(path, "rb") as f:
+            head = f.read(self.HEADER.size)
+        if len(head) < self.HEADER.size:
+            return False
+        magic, cap, bits, hashes, _ = self.HEADER.unpack(head)
+        return magic == self.MAGIC and cap == capacity and bits == self.bits and hashes == self.hashes
+
+    def _positions(self, handle):
+        digest = hashlib.blake2b(handle.encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, handle):
+        base = self.HEADER.size
+        return all(self._mm[base + (p >> 3)] & (1 << (p & 7)) for p in self._positions(handle))
+
+    def add(self, handle):
+        base = self.HEADER.size
+        for p in self._positions(handle):
+            self._mm[base + (p >> 3)] |= 1 << (p & 7)
+        self.count += 1
+        self.HEADER.pack_into(self._mm, 0, self.MAGIC, self.capacity, self.bits, self.hashes, self.count)
+
+    def full(self):
+        return self.count >= self.capacity
+
+    def close(self):
+        self._mm.flush()
+        self._mm.close()
+        self._file.close()
+
+
+class Frontier:
+    """SQLite-backed crawl frontier: visited set, queue and per-handle outcomes.
+
+    Every change is its own small transaction, so a crash loses at most the
+    profile being visited, and history is never truncated. Membership checks
+    are primary-key lookups.
+    """
+    def __init__(self, path=FRONTIER_DB):
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(FRONTIER_SCHEMA)
+        self._popped = {}  # handle → queue priority, while its visit is in flight
+        self._refresh_rates()
+        if os.path.exists(STATE_FILE) and not self.db.execute("SELECT 1 FROM visited LIMIT 1").fetchone():
+            self._import_state_file()
+        self.seen = self._open_filter(SEEN_FILTER)
+        if not len(self):
+            self.push(SEED_HANDLES, len(SEED_HANDLES), source="seed")
+
+    def _open_filter(self, path, capacity=SEEN_CAPACITY):
+        """Open the seen-filter, rebuilding it from the tables when new or resized."""
+        known = self.db.execute(
+            "SELECT (SELECT COUNT(*) FROM visited) + (SELECT COUNT(*) FROM queue)").fetchone()[0]
+        while known >= capacity:
+            capacity *= 2
+        seen = SeenFilter(path, capacity)
+        if seen.fresh and known:
+            for (h,) in self.db.execute("SELECT handle FROM visited UNION SELECT handle FROM queue"):
+                seen.add(h)
+            log(f"  Rebuilt seen-filter with {seen.count:,} handles (capacity {capacity:,})")
+        return seen
+
+    def is_seen(self, handle):
+        """Exact membership in visited ∪ queued, answered by the Bloom filter when possible."""
+        if handle not in self.seen:
+            return False
+        return self.is_visited(handle) or self.is_queued(handle)
+
+    def _mark_seen(self, handles):
+        for h in handles:
+            self.seen.add(h)
+        if self.seen.full():
+            capacity = self.seen.capacity * 2
+            self.seen.close()
+            os.remove(SEEN_FILTER)
+            self.seen = self._open_filter(SEEN_FILTER, capacity)
+
+    def _import_state_file(self):
+        """One-time migration from the old scraper_state.json."""
         with open(STATE_FILE) as f:
-            return json.load(f)
-    return {
-        "visited": [],
-        "queue": list(SEED_HANDLES),
-        "inserted": [],
-        "skipped": [],
-        "total_discovered": 0,
-        "total_inserted": 0,
-        "runs": 0,
-    }
-
-def save_state(state):
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+            state = json.load(f)
+        now = _now()
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany("INSERT OR IGNORE INTO visited VALUES (?, ?, 'state_file')",
+                                [(h, now) for h in state.get("visited", [])])
+            self.db.executemany("INSERT OR IGNORE INTO queue (handle, source, added_at) VALUES (?, 'state_file', ?)",
+                                [(h, now) for h in state.get("queue", [])])
+            for outcome in ("inserted", "skipped"):
+                self.db.executemany("INSERT OR REPLACE INTO outcomes VALUES (?, ?, NULL, ?)",
+                                    [(h, outcome, now) for h in state.get(outcome, [])])
+            for name in ("total_discovered", "total_inserted", "runs"):
+                self.db.execute("INSERT OR REPLACE INTO counters VALUES (?, ?)", (name, state.get(name, 0)))
+        os.replace(STATE_FILE, STATE_FILE + ".migrated")
+        log(f"  Imported {STATE_FILE} into {self.path}")
+
+    def pop(self):
+        """Take the next due, unvisited handle off the queue and mark it visited.
+
+        A visit that fails must be handed back with `retry`, which puts the
+        handle back on the queue.
+        """
+        while True:
+            with self.db:
+                self.db.execute("BEGIN IMMEDIATE")
+                row = self.db.execute(
+                    "SELECT q.seq, q.handle, q.source, q.priority FROM queue q "
+                    "LEFT JOIN retries r ON r.handle = q.handle "
+                    "WHERE r.retry_at IS NULL OR r.retry_at <= ? "
+                    "ORDER BY q.priority DESC, q.seq LIMIT 1", (_now(),)).fetchone()
+                if not row:
+                    return None
+                seq, handle, source, priority = row
+                self.db.execute("DELETE FROM queue WHERE seq = ?", (seq,))
+                handle = handle.lower().strip().lstrip("@")
+                if len(handle) < 2 or self.is_visited(handle):
+                    continue
+                self.db.execute("INSERT INTO visited VALUES (?, ?, ?)", (handle, _now(), source))
+                self._popped[handle] = priority
+                return handle
+
+    def retry(self, handle, reason):
+        """Requeue a handle whose visit failed, after a backoff; returns False once it is given up on.
+
+        After VISIT_MAX_ATTEMPTS failures the handle stays visited with a
+        "failed" outcome.
+        """
+        priority = self._popped.pop(handle, 0.0)
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            row = self.db.execute("SELECT attempts FROM retries WHERE handle = ?", (handle,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            if attempts >= VISIT_MAX_ATTEMPTS:
+                self.db.execute("DELETE FROM retries WHERE handle = ?", (handle,))
+                self.db.execute("INSERT OR REPLACE INTO outcomes VALUES (?, 'failed', NULL, ?)", (handle, _now()))
+                return False
+            source = self.db.execute("SELECT source FROM visited WHERE handle = ?", (handle,)).fetchone()[0]
+            delay = VISIT_RETRY_DELAY * 2 ** (attempts - 1)
+            retry_at = (datetime.now(timezone.utc) + timedelta(seconds=delay)).isoformat()
+            self.db.execute("DELETE FROM visited WHERE handle = ?", (handle,))
+            self.db.execute("INSERT OR IGNORE INTO queue (handle, priority, source, added_at) VALUES (?, ?, ?, ?)",
+                            (handle, priority, source, _now()))
+            self.db.execute("INSERT OR REPLACE INTO retries VALUES (?, ?, ?)", (handle, attempts, retry_at))
+        log(f"    Requeued @{handle} after {reason} (attempt {attempts}/{VISIT_MAX_ATTEMPTS}, retry in {delay}s)",
+            handle=handle, phase="frontier", outcome="retry", attempts=attempts)
+        return True
+
+    def push(self, handles, cap, source=None, hints=None, boost=0.0):
+        """Queue the `cap` most promising unseen handles; returns how many unseen handles there were.
+
+        `hints` maps a handle to what the discovery page showed about it
+        ({"followers": int, "text": str}); `boost` is added to every score,
+        e.g. for suggestions taken from a profile that qualified.
+        """
+        hints = hints or {}
+        new = [h for h in dict.fromkeys(handles) if not self.is_seen(h)]
+        if new:
+            scored = sorted(((self.score(h, source, hints.get(h), boost), h) for h in new),
+                            key=lambda x: x[0], reverse=True)[:cap]
+            now = _now()
+            with self.db:
+                self.db.execute("BEGIN")
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO queue (handle, priority, source, added_at) VALUES (?, ?, ?, ?)",
+                    [(h, score, source, now) for score, h in scored])
+                self.incr("total_discovered", len(new))
+            self._mark_seen([h for _, h in scored])
+        return len(new)
+
+    def score(self, handle, source, hint=None, boost=0.0):
+        """Cheap estimate of how likely a handle is to qualify; higher is visited first."""
+        hint = hint or {}
+        # Smoothed qualify rate of this kind of source, 0..1 → 0..10
+        score = 10 * self.rates.get(source_kind(source), 0.5) + boost
+        followers = hint.get("followers") or 0
+        if followers:
+            score += 6 if followers >= MIN_FOLLOWERS else -4
+            score += min(math.log10(followers), 8) / 2
+        text = f"{handle} {hint.get('text', '')}".lower()
+        score += min(sum(k in text for k in BRAINROT_KEYWORDS), 3)
+        return round(score, 3)
+
+    def record(self, handle, outcome, followers=None):
+        self._popped.pop(handle, None)
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.execute("INSERT OR REPLACE INTO outcomes VALUES (?, ?, ?, ?)",
+                            (handle, outcome, followers, _now()))
+            self.db.execute("DELETE FROM retries WHERE handle = ?", (handle,))
+            if outcome == "inserted":
+                self.incr("total_inserted")
+        self._recorded += 1
+        if self._recorded % 20 == 0:
+            self._refresh_rates()
+
+    def source_stats(self):
+        """Per source kind: (visits, qualified, inserted)."""
+        stats = {}
+        for source, outcome, n in self.db.execute(
+                "SELECT v.source, o.outcome, COUNT(*) FROM visited v "
+                "LEFT JOIN outcomes o ON o.handle = v.handle GROUP BY v.source, o.outcome"):
+            row = stats.setdefault(source_kind(source), [0, 0, 0])
+            row[0] += n
+            if outcome in ("inserted", "duplicate"):
+                row[1] += n
+            if outcome == "inserted":
+                row[2] += n
+        return stats
+
+    def _refresh_rates(self):
+        self._recorded = 0
+        self.rates = {kind: (q + 1) / (v + 2) for kind, (v, q, _) in self.source_stats().items()}
+
+    def is_visited(self, handle):
+        return self.db.execute("SELECT 1 FROM visited WHERE handle = ?", (handle,)).fetchone() is not None
+
+    def is_queued(self, handle):
+        return self.db.execute("SELECT 1 FROM queue WHERE handle = ?", (handle,)).fetchone() is not None
+
+    def incr(self, name, n=1):
+        self.db.execute("INSERT INTO counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?",
+                        (name, n, n))
+
+    def counter(self, name):
+        row = self.db.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def visited_count(self):
+        return self.db.execute("SELECT COUNT(*) FROM visited").fetchone()[0]
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM queue").fetchone()[0]
+
+    def close(self):
+        self.seen.close()
+        self.db.close()
 
 
 # ─── Supabase ────────────────────────────────────────────
-def already_in_db(handle):
-    """Check if handle is already in the database."""
-    try:
-        url = f"{SUPABASE_URL}/rest/v1/people?platform_handles->>tiktok=cs.{json.dumps(handle)}&select=name&limit=1"
-        # Simpler approach: search by name pattern
-        return False  # Let slug uniqueness handle dedup
-    except:
-        return False
-
 def check_name_exists(name):
-    """Check if a person with similar name exists."""
+    """Check if a person with similar name exists (network fallback for IdentityIndex)."""
     try:
         r = requests.get(
             f"{SUPABASE_URL}/rest/v1/people?name=ilike.{requests.utils.quote(name)}&select=id&limit=1",
@@ -125,8 +628,8 @@ def check_name_exists(name):
     except:
         return False
 
-def insert_person(data):
-    """Insert a person into Supabase."""
+def person_record(data):
+    """Build the people row for a scraped profile."""
     slug = re.sub(r'-+', '-', re.sub(r'[\s_]+', '-', re.sub(r'[^\w\s-]', '', data["name"].lower().strip()))).strip('-')
     slug = f"{slug}-{uuid.uuid4().hex[:6]}"
 
@@ -153,31 +656,180 @@ def insert_person(data):
             "_discovered_at": datetime.now(timezone.utc).isoformat(),
         },
     }
+    return record
 
+
+def post_people(records):
+    """Bulk-insert people rows in one PostgREST request; returns (status code or None, error string or None)."""
     try:
         r = requests.post(
             f"{SUPABASE_URL}/rest/v1/people",
-            headers=HEADERS, json=record, timeout=15
+            headers=HEADERS, json=records, timeout=30
         )
         if r.status_code in (200, 201):
-            log(f"  DB ++ {data['name']} (@{data['handle']}) — {data['followers']:,} followers")
-            return True
-        else:
-            log(f"  DB ERR {r.status_code}: {r.text[:100]}")
-            return False
+            return r.status_code, None
+        return r.status_code, f"{r.status_code}: {r.text[:100]}"
     except Exception as e:
-        log(f"  DB EXC: {e}")
-        return False
+        return None, str(e)
+
+
+class InsertBuffer:
+    """Write-behind buffer so browser workers never wait on Supabase.
+
+    `add` only queues the row. Batches are POSTed off the event loop when
+    WRITE_BATCH_SIZE rows are waiting or every WRITE_FLUSH_INTERVAL seconds,
+    `stop` ends `run` after its current flush (never cancel `run`: a batch
+    cut off mid-POST may still land and would be sent again), and `close`
+    flushes whatever is left. A failed batch is put back and retried on
+    later flushes with exponential backoff; after WRITE_MAX_ATTEMPTS its
+    rows are appended to DEAD_LETTER_FILE for `replay_dead_letters`. A
+    batch rejected for its content (WRITE_SPLIT_STATUSES) is halved until
+    the bad rows are isolated; those go straight to the dead-letter file
+    and the rest land.
+    `on_written(record, handle, followers)` runs for every row that lands.
+    """
+    def __init__(self, on_written=None, batch_size=WRITE_BATCH_SIZE, interval=WRITE_FLUSH_INTERVAL):
+        self.on_written = on_written
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pending = []    # (record, handle, followers)
+        self.attempts = 0
+        self.retry_at = 0.0
+        self.written = 0
+        self.failed = 0
+        self._lock = asyncio.Lock()
+        self._flushing = None
+        self._stopping = asyncio.Event()
+
+    def add(self, record, handle, followers):
+        self.pending.append((record, handle, followers))
+        if len(self.pending) >= self.batch_size and not self._busy():
+            self._flushing = asyncio.create_task(self.flush())
+
+    def _busy(self):
+        return self._flushing is not None and not self._flushing.done()
+
+    async def run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                await self.flush()
+
+    def stop(self):
+        self._stopping.set()
+
+    async def flush(self, force=False):
+        async with self._lock:
+            while self.pending and (force or time.monotonic() >= self.retry_at):
+                batch = self.pending[:self.batch_size]
+                started = time.monotonic()
+                retry, error = await self._post(batch)
+                del self.pending[:len(batch)]
+                if retry:
+                    self.attempts += 1
+                    log(f"  DB ERR flushing {len(retry)} rows (attempt {self.attempts}/{WRITE_MAX_ATTEMPTS}): {error}",
+                        logging.WARNING, phase="db", rows=len(retry), latency_ms=ms(started), outcome="error")
+                    if self.attempts < WRITE_MAX_ATTEMPTS:
+                        self.pending[:0] = retry
+                        self.retry_at = time.monotonic() + min(300, 5 * 2 ** self.attempts)
+                        if force:
+                            await asyncio.sleep(min(10, 2 ** self.attempts))
+                        else:
+                            return
+                        continue
+                    self._dead_letter(retry, error)
+                self.attempts = 0
+                self.retry_at = 0.0
+
+    async def _post(self, batch):
+        """POST `batch`, halving it on row-level rejections; returns (rows to retry later, their error)."""
+        started = time.monotonic()
+        status, error = await asyncio.to_thread(post_people, [r for r, _, _ in batch])
+        METRICS.observe("scraper_db_insert_seconds", time.monotonic() - started)
+        METRICS.inc("scraper_db_batches_total", outcome="error" if error else "ok")
+        if not error:
+            for record, handle, followers in batch:
+                log(f"  DB ++ {record['name']} (@{handle}) — {followers:,} followers",
+                    handle=handle, phase="db", followers=followers, latency_ms=ms(started), outcome="inserted")
+                if self.on_written:
+                    self.on_written(record, handle, followers)
+            self.written += len(batch)
+            METRICS.inc("scraper_db_rows_total", len(batch), outcome="inserted")
+            return [], None
+        if status not in WRITE_SPLIT_STATUSES:
+            return batch, error  # transient or server-side: the whole batch waits for the next attempt
+        if len(batch) == 1:
+            self._dead_letter(batch, error)  # the row itself is bad; resending it won't help
+            return [], None
+        mid = len(batch) // 2
+        retry, retry_error = await self._post(batch[:mid])
+        later, later_error = await self._post(batch[mid:])
+        return retry + later, later_error or retry_error
+
+    def _dead_letter(self, batch, error):
+        self.failed += len(batch)
+        METRICS.inc("scraper_db_rows_total", len(batch), outcome="dead_letter")
+        with open(DEAD_LETTER_FILE, "a") as f:
+            for record, handle, followers in batch:
+                f.write(json.dumps({"record": record, "handle": handle, "followers": followers,
+                                    "error": error, "failed_at": _now()}) + "\n")
+        log(f"  DB gave up on {len(batch)} rows — written to {DEAD_LETTER_FILE}",
+            logging.ERROR, phase="db", rows=len(batch), outcome="dead_letter")
+
+    async def close(self):
+        self.stop()
+        if self._busy():
+            await self._flushing
+        await self.flush(force=True)
+        log(f"  Insert buffer closed: {self.written} written, {self.failed} dead-lettered")
+
+
+async def replay_dead_letters():
+    """Re-send every row in DEAD_LETTER_FILE; rows that fail again are dead-lettered anew."""
+    if not os.path.exists(DEAD_LETTER_FILE):
+        log("  No dead letters to replay")
+        return
+    replaying = DEAD_LETTER_FILE + ".replaying"
+    os.replace(DEAD_LETTER_FILE, replaying)
+    frontier = Frontier()
+    people = IdentityIndex(supabase_url=SUPABASE_URL, supabase_key=SUPABASE_KEY)
+
+    def landed(record, handle, followers):
+        people.add(record)
+        frontier.record(handle, "inserted", followers)
+
+    writer = InsertBuffer(on_written=landed)
+    try:
+        with open(replaying) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    writer.add(entry["record"], entry["handle"], entry["followers"])
+        log(f"  Replaying {len(writer.pending)} dead-lettered rows from {DEAD_LETTER_FILE}")
+        await writer.close()
+        os.remove(replaying)
+    finally:
+        frontier.close()
+        people.close()
 
 
 # ─── TikTok extraction ───────────────────────────────────
+REHYDRATION_RE = re.compile(
+    r'<script[^>]*id="(__UNIVERSAL_DATA_FOR_REHYDRATION__|SIGI_STATE)"[^>]*>(.*?)</script>', re.S
+)
+HANDLE_LINK_RE = re.compile(r'/@([a-zA-Z0-9_.]+)')
+BLOCKED_RESOURCES = {"image", "media", "font", "stylesheet"}
+
 def parse_followers(text):
     """Parse '1.2M' or '500K' into an integer."""
     if not text:
         return 0
     text = text.strip().upper().replace(",", "")
     try:
-        if "M" in text:
+        if "B" in text:
+            return int(float(text.replace("B", "")) * 1_000_000_000)
+        elif "M" in text:
             return int(float(text.replace("M", "")) * 1_000_000)
         elif "K" in text:
             return int(float(text.replace("K", "")) * 1_000)
@@ -187,6 +839,92 @@ def parse_followers(text):
         return 0
 
 
+def profile_from_rehydration(data):
+    """Profile fields from a __UNIVERSAL_DATA_FOR_REHYDRATION__ payload."""
+    # Navigate the data structure
+    default_scope = data.get("__DEFAULT_SCOPE__", {})
+    user_detail = default_scope.get("webapp.user-detail", {})
+    user_info = user_detail.get("userInfo", {})
+    user = user_info.get("user", {})
+    stats = user_info.get("stats", {})
+
+    if not user.get("uniqueId"):
+        return None
+    return {
+        "handle": user.get("uniqueId", ""),
+        "name": user.get("nickname", user.get("uniqueId", "")),
+        "followers": stats.get("followerCount", 0),
+        "following": stats.get("followingCount", 0),
+        "likes": stats.get("heartCount", 0),
+        "videos": stats.get("videoCount", 0),
+        "bio": user.get("signature", ""),
+        "verified": user.get("verified", False),
+        "avatar": user.get("avatarLarger", "") or user.get("avatarMedium", ""),
+    }
+
+
+def profile_from_sigi_state(data):
+    """Profile fields from a legacy SIGI_STATE payload."""
+    user_module = data.get("UserModule", {})
+    users = user_module.get("users", {})
+    stats_module = user_module.get("stats", {})
+    if not users:
+        return None
+    uid = list(users.keys())[0]
+    user = users[uid]
+    stat = stats_module.get(uid, {})
+    return {
+        "handle": user.get("uniqueId", uid),
+        "name": user.get("nickname", uid),
+        "followers": stat.get("followerCount", 0),
+        "following": stat.get("followingCount", 0),
+        "likes": stat.get("heartCount", 0),
+        "videos": stat.get("videoCount", 0),
+        "bio": user.get("signature", ""),
+        "verified": user.get("verified", False),
+        "avatar": user.get("avatarLarger", ""),
+    }
+
+
+def parse_profile_html(html):
+    """Profile data from the rehydration JSON embedded in raw profile HTML."""
+    for m in REHYDRATION_RE.finditer(html):
+        try:
+            data = json.loads(m.group(2))
+        except ValueError:
+            continue
+        if m.group(1) == "SIGI_STATE":
+            profile = profile_from_sigi_state(data)
+        else:
+            profile = profile_from_rehydration(data)
+        if profile:
+            return profile
+    return None
+
+
+async def fetch_profile(context, handle):
+    """Fast path: GET the profile HTML with the context's cookies, no rendering.
+
+    Returns (profile, linked handles); profile is None when the response has
+    no usable rehydration JSON (CAPTCHA, layout change), so the caller can
+    fall back to rendering the page.
+    """
+    try:
+        resp = await context.request.get(
+            f"https://www.tiktok.com/@{handle}",
+            headers={"Accept": "text/html,application/xhtml+xml"},
+            timeout=15000,
+        )
+        if not resp.ok:
+            return None, []
+        html = await resp.text()
+    except Exception as e:
+        log(f"    Fast path failed: {e}", logging.DEBUG, handle=handle, phase="fetch", outcome="error")
+        return None, []
+    handles = list(dict.fromkeys(h.lower() for h in HANDLE_LINK_RE.findall(html)))
+    return parse_profile_html(html), handles
+
+
 async def extract_profile_data(page):
     """Extract profile data from a TikTok profile page."""
     # Strategy 1: Try __UNIVERSAL_DATA_FOR_REHYDRATION__
@@ -196,28 +934,12 @@ async def extract_profile_data(page):
             if (el) return JSON.parse(el.textContent);
             return null;
         }""")
-        if data:
-            # Navigate the data structure
-            default_scope = data.get("__DEFAULT_SCOPE__", {})
-            user_detail = default_scope.get("webapp.user-detail", {})
-            user_info = user_detail.get("userInfo", {})
-            user = user_info.get("user", {})
-            stats = user_info.get("stats", {})
-
-            if user.get("uniqueId"):
-                return {
-                    "handle": user.get("uniqueId", ""),
-                    "name": user.get("nickname", user.get("uniqueId", "")),
-                    "followers": stats.get("followerCount", 0),
-                    "following": stats.get("followingCount", 0),
-                    "likes": stats.get("heartCount", 0),
-                    "videos": stats.get("videoCount", 0),
-                    "bio": user.get("signature", ""),
-                    "verified": user.get("verified", False),
-                    "avatar": user.get("avatarLarger", "") or user.get("avatarMedium", ""),
-                }
+        profile = profile_from_rehydration(data) if data else None
+        if profile:
+            METRICS.inc("scraper_extraction_total", strategy="1")
+            return profile
     except Exception as e:
-        log(f"    Strategy 1 failed: {e}")
+        log(f"    Strategy 1 failed: {e}", logging.DEBUG, phase="extract", strategy=1, outcome="error")
 
     # Strategy 2: Try SIGI_STATE
     try:
@@ -226,27 +948,12 @@ async def extract_profile_data(page):
             if (el) return JSON.parse(el.textContent);
             return null;
         }""")
-        if data:
-            user_module = data.get("UserModule", {})
-            users = user_module.get("users", {})
-            stats_module = user_module.get("stats", {})
-            if users:
-                uid = list(users.keys())[0]
-                user = users[uid]
-                stat = stats_module.get(uid, {})
-                return {
-                    "handle": user.get("uniqueId", uid),
-                    "name": user.get("nickname", uid),
-                    "followers": stat.get("followerCount", 0),
-                    "following": stat.get("followingCount", 0),
-                    "likes": stat.get("heartCount", 0),
-                    "videos": stat.get("videoCount", 0),
-                    "bio": user.get("signature", ""),
-                    "verified": user.get("verified", False),
-                    "avatar": user.get("avatarLarger", ""),
-                }
+        profile = profile_from_sigi_state(data) if data else None
+        if profile:
+            METRICS.inc("scraper_extraction_total", strategy="2")
+            return profile
     except Exception as e:
-        log(f"    Strategy 2 failed: {e}")
+        log(f"    Strategy 2 failed: {e}", logging.DEBUG, phase="extract", strategy=2, outcome="error")
 
     # Strategy 3: DOM scraping fallback
     try:
@@ -285,6 +992,7 @@ async def extract_profile_data(page):
         }""")
 
         if info.get("handle") or info.get("followers_text"):
+            METRICS.inc("scraper_extraction_total", strategy="3")
             return {
                 "handle": info.get("handle", "").lstrip("@"),
                 "name": info.get("name", info.get("handle", "")),
@@ -296,8 +1004,9 @@ async def extract_profile_data(page):
                 "avatar": info.get("avatar", ""),
             }
     except Exception as e:
-        log(f"    Strategy 3 failed: {e}")
+        log(f"    Strategy 3 failed: {e}", logging.DEBUG, phase="extract", strategy=3, outcome="error")
 
+    METRICS.inc("scraper_extraction_total", strategy="none")
     return None
 
 
@@ -323,91 +1032,363 @@ async def discover_suggested(page):
     return handles
 
 
+# Handles plus the text of the card each link sits in (search results show
+# follower counts there; hashtag videos show captions)
+HANDLE_CARDS_JS = """() => {
+    const cards = {};
+    for (const a of document.querySelectorAll('a[href*="/@"]')) {
+        const match = a.getAttribute('href').match(/\\/@([a-zA-Z0-9_.]+)/);
+        if (!match || !match[1]) continue;
+        const card = a.closest('[data-e2e]') || a.parentElement;
+        const text = ((card && card.innerText) || '').slice(0, 300);
+        const h = match[1].toLowerCase();
+        if (!cards[h] || text.length > cards[h].length) cards[h] = text;
+    }
+    return cards;
+}"""
+HANDLE_COUNT_JS = "() => document.querySelectorAll('a[href*=\"/@\"]').length"
+HANDLES_ABOVE_JS = "(n) => document.querySelectorAll('a[href*=\"/@\"]').length > n"
+CARD_FOLLOWERS_RE = re.compile(r'([\d.,]+\s*[KMB]?)\s*Followers', re.I)
+
+
+def card_hints(cards):
+    """Turn {handle: card text} into push() hints with a follower estimate."""
+    hints = {}
+    for h, text in cards.items():
+        m = CARD_FOLLOWERS_RE.search(text or "")
+        hints[h] = {"followers": parse_followers(m.group(1).replace(" ", "")) if m else 0, "text": text or ""}
+    return hints
+
+
 async def discover_from_hashtag(page, tag):
-    """Browse a hashtag page and extract creator handles."""
-    handles = []
+    """Browse a hashtag page and extract creator handles with their card hints."""
+    cards = {}
     url = f"https://www.tiktok.com/tag/{tag}"
     try:
         await page.goto(url, wait_until="domcontentloaded", timeout=20000)
-        await page.wait_for_timeout(3000 + random.randint(0, 2000))
+        await wait_until(page, HANDLES_ABOVE_JS, 0)
 
-        found = await page.evaluate("""() => {
-            const links = Array.from(document.querySelectorAll('a[href*="/@"]'));
-            const handles = new Set();
-            for (const a of links) {
-                const href = a.getAttribute('href');
-                const match = href.match(/\/@([a-zA-Z0-9_.]+)/);
-                if (match && match[1]) handles.add(match[1].toLowerCase());
-            }
-            return Array.from(handles);
-        }""")
-        if found:
-            handles.extend(found)
+        cards.update(await page.evaluate(HANDLE_CARDS_JS) or {})
 
         # Scroll down to load more
         for _ in range(3):
+            seen = await page.evaluate(HANDLE_COUNT_JS)
             await page.evaluate("window.scrollBy(0, 1000)")
-            await page.wait_for_timeout(1500)
-            more = await page.evaluate("""() => {
-                const links = Array.from(document.querySelectorAll('a[href*="/@"]'));
-                const handles = new Set();
-                for (const a of links) {
-                    const href = a.getAttribute('href');
-                    const match = href.match(/\/@([a-zA-Z0-9_.]+)/);
-                    if (match && match[1]) handles.add(match[1].toLowerCase());
-                }
-                return Array.from(handles);
-            }""")
-            if more:
-                handles.extend(more)
+            if not await wait_until(page, HANDLES_ABOVE_JS, seen, timeout=3000):
+                break
+            cards.update(await page.evaluate(HANDLE_CARDS_JS) or {})
 
     except Exception as e:
-        log(f"  Hashtag #{tag} error: {e}")
+        log(f"  Hashtag #{tag} error: {e}", logging.WARNING, phase="hashtag", tag=tag, outcome="error")
 
-    return list(set(handles))
+    return card_hints(cards)
 
 
 async def discover_from_search(page, query):
-    """Search TikTok for a query and extract creator handles."""
-    handles = []
+    """Search TikTok for a query and extract creator handles with their card hints."""
+    cards = {}
     url = f"https://www.tiktok.com/search/user?q={requests.utils.quote(query)}"
     try:
         await page.goto(url, wait_until="domcontentloaded", timeout=20000)
-        await page.wait_for_timeout(3000 + random.randint(0, 2000))
+        await wait_until(page, HANDLES_ABOVE_JS, 0)
 
-        found = await page.evaluate("""() => {
-            const links = Array.from(document.querySelectorAll('a[href*="/@"]'));
-            const handles = new Set();
-            for (const a of links) {
-                const href = a.getAttribute('href');
-                const match = href.match(/\/@([a-zA-Z0-9_.]+)/);
-                if (match && match[1]) handles.add(match[1].toLowerCase());
-            }
-            return Array.from(handles);
-        }""")
-        if found:
-            handles.extend(found)
+        cards.update(await page.evaluate(HANDLE_CARDS_JS) or {})
     except Exception as e:
-        log(f"  Search '{query}' error: {e}")
+        log(f"  Search '{query}' error: {e}", logging.WARNING, phase="search", query=query, outcome="error")
+
+    return card_hints(cards)
+
+
+# ─── Worker pool ─────────────────────────────────────────
+class Pacer:
+    """Feedback-driven spacing for one endpoint, shared by every worker.
+
+    Healthy responses shrink the gap towards the floor; CAPTCHAs, timeouts
+    and empty extractions multiply it by PACE_BACKOFF and push the next slot
+    out by the new gap, up to the ceiling. Gaps get ±25% jitter.
+    """
+    def __init__(self, name, start, floor, ceiling):
+        self.name = name
+        self.delay = start
+        self.floor = floor
+        self.ceiling = ceiling
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+        METRICS.set("scraper_pace_seconds", round(self.delay, 3), endpoint=name)
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next)
+            self._next = at + self.delay * random.uniform(0.75, 1.25)
+        if at > now:
+            await asyncio.sleep(at - now)
+
+    def ok(self, latency=None):
+        factor = 1.25 if latency and latency > PACE_SLOW_LOAD else PACE_SPEEDUP
+        self._set(self.delay * factor)
+
+    def fail(self, reason):
+        self._set(self.delay * PACE_BACKOFF)
+        self._next = max(self._next, time.monotonic() + self.delay)
+        METRICS.inc("scraper_pace_backoffs_total", endpoint=self.name, reason=reason)
+        log(f"  Pacing {self.name}: {reason} — gap now {self.delay:.1f}s", logging.WARNING,
+            phase="pacing", endpoint=self.name, reason=reason, gap_s=round(self.delay, 2))
+
+    def _set(self, delay):
+        self.delay = min(self.ceiling, max(self.floor, delay))
+        METRICS.set("scraper_pace_seconds", round(self.delay, 3), endpoint=self.name)
+
+
+def make_pacers(per_minute=VISITS_PER_MINUTE):
+    pacers = {name: Pacer(name, *bounds) for name, bounds in PACING.items()}
+    # --rate stays a hard cap: the profile gap never drops below 60/rate
+    profile = pacers["profile"]
+    profile.floor = max(profile.floor, 60.0 / max(per_minute, 0.1))
+    profile._set(max(profile.delay, profile.floor))
+    return pacers
+
+
+PROFILE_READY_JS = """() => !!(
+    document.getElementById('__UNIVERSAL_DATA_FOR_REHYDRATION__') ||
+    document.getElementById('SIGI_STATE') ||
+    document.querySelector('[data-e2e="followers-count"]') ||
+    document.querySelector('[id*="captcha"], [class*="captcha"]')
+)"""
+
+
+async def wait_until(page, js, arg=None, timeout=PAGE_READY_TIMEOUT):
+    """Wait for `js` to turn truthy instead of sleeping a fixed time; False on timeout."""
+    try:
+        await page.wait_for_function(js, arg=arg, timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+async def new_context(browser):
+    context = await browser.new_context(
+        user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+        viewport={"width": 1920, "height": 1080},
+        locale="en-US",
+        timezone_id="America/New_York",
+    )
+
+    # Stealth: remove webdriver flag
+    await context.add_init_script("""
+        Object.defineProperty(navigator, 'webdriver', { get: () => false });
+        Object.defineProperty(navigator, 'plugins', { get: () => [1,2,3,4,5] });
+        window.chrome = { runtime: {} };
+    """)
+
+    # Nothing we scrape needs images, video, fonts or CSS
+    async def block_heavy(route):
+        if route.request.resource_type in BLOCKED_RESOURCES:
+            await route.abort()
+        else:
+            await route.continue_()
+    await context.route("**/*", block_heavy)
+    return context
+
+
+def ms(started):
+    return round((time.monotonic() - started) * 1000)
+
+
+async def visit_profile(page, handle, frontier, people, writer, tag):
+    """Visit one profile; returns "ok", "captcha" or "no_data" for the pacer."""
+    log(f"\n  {tag} Visiting @{handle}...", worker=tag, handle=handle, phase="visit")
+    started = time.monotonic()
+    ev = {"worker": tag, "handle": handle, "phase": "profile"}
+    data, suggested = await fetch_profile(page.context, handle)
+    ev["path"] = "fast" if data else "render"
+    METRICS.inc("scraper_profiles_total", path=ev["path"])
+    if data:
+        METRICS.inc("scraper_extraction_total", strategy="fast")
+    else:
+        # Slow path: render the page and run the in-page strategies
+        url = f"https://www.tiktok.com/@{handle}"
+        await page.goto(url, wait_until="domcontentloaded", timeout=20000)
+        await wait_until(page, PROFILE_READY_JS)
+
+        # Check for captcha/block
+        page_text = await page.text_content("body") or ""
+        if "captcha" in page_text.lower() or "verify" in page_text.lower()[:500]:
+            log(f"    {tag} CAPTCHA on @{handle}", logging.WARNING, latency_ms=ms(started), outcome="captcha", **ev)
+            METRICS.inc("scraper_captcha_total")
+            return "captcha"
+
+        data = await extract_profile_data(page)
+        suggested = await discover_suggested(page)
+    METRICS.observe("scraper_page_load_seconds", time.monotonic() - started, path=ev["path"])
+
+    if not data or not data.get("handle"):
+        METRICS.inc("scraper_outcomes_total", outcome="no_data")
+        log(f"    {tag} Could not extract data for @{handle}", logging.WARNING,
+            latency_ms=ms(started), outcome="no_data", **ev)
+        return "no_data"
+
+    followers = data.get("followers", 0)
+    ev.update(latency_ms=ms(started), followers=followers)
+    log(f"    {tag} {data['name']} — {followers:,} followers — bio: {data.get('bio', '')[:60]}")
+
+    # Discover suggested handles from this page; a qualifying or seed
+    # profile's neighbours are more likely to qualify too
+    boost = (3 if followers >= MIN_FOLLOWERS else 0) + (2 if handle in SEED_HANDLES else 0)
+    found = frontier.push(suggested, 20, source=f"@{handle}", boost=boost)  # Cap to avoid explosion
+    if found:
+        log(f"    {tag} Found {found} new handles from suggestions", found=found, **ev)
+
+    # Check if qualifies
+    if followers < MIN_FOLLOWERS:
+        log(f"    {tag} SKIP: {followers:,} < {MIN_FOLLOWERS:,} minimum", outcome="skipped", **ev)
+        METRICS.inc("scraper_outcomes_total", outcome="skipped")
+        frontier.record(handle, "skipped", followers)
+        return "ok"
+
+    # Check if already in DB
+    if people.ready:
+        exists = people.lookup({"name": data["name"], "tiktok_handle": data["handle"]}) is not None
+    else:
+        exists = await asyncio.to_thread(check_name_exists, data["name"])
+    if exists:
+        log(f"    {tag} SKIP: already in database", outcome="duplicate", **ev)
+        METRICS.inc("scraper_outcomes_total", outcome="duplicate")
+        frontier.record(handle, "duplicate", followers)
+        return "ok"
+
+    # Insert (write-behind; the outcome and identity are recorded once the batch lands)
+    data["discovered_from"] = "tiktok_scraper"
+    record = person_record(data)
+    while people.lookup_key("slug", record["slug"]):  # the random suffix collided
+        record = person_record(data)
+    writer.add(record, handle, followers)
+    log(f"    {tag} Queued @{handle} for insert", outcome="queued", **ev)
+    METRICS.inc("scraper_outcomes_total", outcome="queued")
+    return "ok"
+
+
+async def explore(page, frontier, pacers, tag):
+    """Refill a short queue from hashtag pages, then from search."""
+    if len(frontier) < 20:
+        hashtag = random.choice(DISCOVERY_HASHTAGS)
+        await pacers["tag"].wait()
+        log(f"\n  {tag} Exploring hashtag #{hashtag}...")
+        started = time.monotonic()
+        hints = await discover_from_hashtag(page, hashtag)
+        found = frontier.push(hints, 30, source=f"#{hashtag}", hints=hints)
+        log(f"    {tag} Found {found} new handles from #{hashtag}",
+            worker=tag, phase="hashtag", tag=hashtag, found=found, latency_ms=ms(started))
+        if hints:
+            pacers["tag"].ok(time.monotonic() - started)
+        else:
+            pacers["tag"].fail("empty")
+
+    if len(frontier) < 10:
+        query = random.choice(DISCOVERY_SEARCHES)
+        await pacers["search"].wait()
+        log(f"\n  {tag} Searching: '{query}'...")
+        started = time.monotonic()
+        hints = await discover_from_search(page, query)
+        found = frontier.push(hints, 30, source=f"search:{query}", hints=hints)
+        log(f"    {tag} Found {found} new handles from search",
+            worker=tag, phase="search", query=query, found=found, latency_ms=ms(started))
+        if hints:
+            pacers["search"].ok(time.monotonic() - started)
+        else:
+            pacers["search"].fail("empty")
+
+
+async def worker(n, browser, frontier, people, writer, pacers, explore_lock):
+    """One browser context pulling handles off the shared frontier.
+
+    Request spacing comes from the shared per-endpoint pacers, which every
+    visit reports back to. A CAPTCHA additionally pauses just this context
+    (doubling per repeat), so it cools down while the others carry on.
+    """
+    tag = f"[w{n}]"
+    context = await new_context(browser)
+    page = await context.new_page()
+    captchas = 0
+    while True:
+        handle = frontier.pop()
+        if handle is None or (len(frontier) < 20 and not explore_lock.locked()):
+            async with explore_lock:
+                await explore(page, frontier, pacers, tag)
+            if handle is None:
+                continue  # an empty queue is throttled by the tag/search pacers
+
+        pacer = pacers["profile"]
+        await pacer.wait()
+        started = time.monotonic()
+        try:
+            status = await visit_profile(page, handle, frontier, people, writer, tag)
+        except Exception as e:
+            log(f"    {tag} ERROR: {e}", logging.ERROR, worker=tag, handle=handle, phase="visit", outcome="error")
+            METRICS.inc("scraper_outcomes_total", outcome="error")
+            status = "timeout" if "timeout" in str(e).lower() else "error"
+
+        if status == "ok":
+            pacer.ok(time.monotonic() - started)
+        else:
+            pacer.fail(status)
+            if not frontier.retry(handle, status):
+                log(f"    {tag} Giving up on @{handle} after {VISIT_MAX_ATTEMPTS} failed visits", logging.WARNING,
+                    worker=tag, handle=handle, phase="visit", outcome="failed")
+
+        if status == "captcha":
+            captchas += 1
+            pause = min(CAPTCHA_PAUSE * 2 ** (captchas - 1), CAPTCHA_MAX_PAUSE)
+            log(f"    {tag} CAPTCHA detected — pausing this context {pause}s", logging.WARNING,
+                worker=tag, phase="backoff", pause_s=pause)
+            await asyncio.sleep(pause)
+            continue
+        captchas = 0
+
+
+async def identity_sync(people):
+    while True:
+        await asyncio.sleep(IDENTITY_SYNC_INTERVAL)
+        try:
+            n = await asyncio.to_thread(people.sync)
+            if n:
+                log(f"  Identity index: {n} changed rows synced ({len(people):,} people)")
+        except Exception as e:
+            log(f"  Identity index sync failed: {e}", logging.WARNING, phase="identity", outcome="error")
+
 
-    return list(set(handles))
+async def report(frontier):
+    while True:
+        await asyncio.sleep(STATUS_INTERVAL)
+        visited, inserted = frontier.visited_count(), frontier.counter("total_inserted")
+        log(f"\n  Queue: {len(frontier)}, Visited: {visited}, DB inserts: {inserted}, "
+            f"inserted/visit: {inserted / max(visited, 1):.3f}",
+            phase="status", queued=len(frontier), visited=visited, inserted=inserted)
+        for kind, (v, q, i) in sorted(frontier.source_stats().items()):
+            log(f"    {kind:<11} {v:>6} visits  qualify {q / max(v, 1):.1%}  inserted/visit {i / max(v, 1):.3f}")
 
 
 # ─── Main loop ───────────────────────────────────────────
-async def main():
+async def main(workers=WORKERS, per_minute=VISITS_PER_MINUTE, metrics_port=METRICS_PORT):
     from playwright.async_api import async_playwright
 
     log("=" * 60)
     log("  TikTok Brainrot Discovery Scraper")
     log("=" * 60)
 
-    state = load_state()
-    visited = set(state["visited"])
-    queue = list(state["queue"])
-    if not queue:
-        queue = list(SEED_HANDLES)
+    frontier = Frontier()
+    frontier.incr("runs")
 
-    log(f"  State: {len(visited)} visited, {len(queue)} queued, {state['total_inserted']} in DB")
+    log(f"  State: {frontier.visited_count()} visited, {len(frontier)} queued, {frontier.counter('total_inserted')} in DB")
+
+    people = IdentityIndex(supabase_url=SUPABASE_URL, supabase_key=SUPABASE_KEY)
+    try:
+        n = await asyncio.to_thread(people.sync)
+        log(f"  Identity index: {len(people):,} people ({n} synced)")
+    except Exception as e:
+        log(f"  Identity index sync failed, falling back to per-profile lookups: {e}", logging.WARNING,
+            phase="identity", outcome="error")
+    log(f"  Pool: {workers} workers, adaptive pacing capped at {per_minute:g} profile visits/min")
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(
@@ -418,137 +1399,74 @@ async def main():
                 "--disable-dev-shm-usage",
             ],
         )
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-            viewport={"width": 1920, "height": 1080},
-            locale="en-US",
-            timezone_id="America/New_York",
-        )
-
-        # Stealth: remove webdriver flag
-        await context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', { get: () => false });
-            Object.defineProperty(navigator, 'plugins', { get: () => [1,2,3,4,5] });
-            window.chrome = { runtime: {} };
-        """)
-
-        page = await context.new_page()
-
-        cycle = 0
-        while True:
-            cycle += 1
-            state["runs"] = cycle
-            log(f"\n{'─'*60}")
-            log(f"  Cycle {cycle} | Queue: {len(queue)} | Visited: {len(visited)} | Inserted: {state['total_inserted']}")
-            log(f"{'─'*60}")
-
-            # ── Phase 1: Process profiles from queue ──
-            profiles_this_cycle = 0
-            max_per_cycle = 10
-
-            while queue and profiles_this_cycle < max_per_cycle:
-                handle = queue.pop(0)
-                handle = handle.lower().strip().lstrip("@")
-
-                if handle in visited or len(handle) < 2:
-                    continue
-
-                visited.add(handle)
-                profiles_this_cycle += 1
-                log(f"\n  [{profiles_this_cycle}/{max_per_cycle}] Visiting @{handle}...")
-
-                try:
-                    url = f"https://www.tiktok.com/@{handle}"
-                    await page.goto(url, wait_until="domcontentloaded", timeout=20000)
-                    await page.wait_for_timeout(2000 + random.randint(500, 2000))
-
-                    # Check for captcha/block
-                    page_text = await page.text_content("body") or ""
-                    if "captcha" in page_text.lower() or "verify" in page_text.lower()[:500]:
-                        log(f"    CAPTCHA detected — pausing 60s")
-                        await asyncio.sleep(60)
-                        continue
-
-                    data = await extract_profile_data(page)
-
-                    if not data or not data.get("handle"):
-                        log(f"    Could not extract data for @{handle}")
-                        continue
 
-                    followers = data.get("followers", 0)
-                    log(f"    {data['name']} — {followers:,} followers — bio: {data.get('bio', '')[:60]}")
-
-                    # Discover suggested handles from this page
-                    suggested = await discover_suggested(page)
-                    new_suggestions = [h for h in suggested if h not in visited and h not in queue]
-                    if new_suggestions:
-                        queue.extend(new_suggestions[:20])  # Cap to avoid explosion
-                        log(f"    Found {len(new_suggestions)} new handles from suggestions")
-                        state["total_discovered"] += len(new_suggestions)
-
-                    # Check if qualifies
-                    if followers < MIN_FOLLOWERS:
-                        log(f"    SKIP: {followers:,} < {MIN_FOLLOWERS:,} minimum")
-                        state["skipped"].append(handle)
-                        continue
-
-                    # Check if already in DB
-                    if check_name_exists(data["name"]):
-                        log(f"    SKIP: already in database")
-                        continue
-
-                    # Insert
-                    data["discovered_from"] = "tiktok_scraper"
-                    if insert_person(data):
-                        state["total_inserted"] += 1
-                        state["inserted"].append(handle)
-
-                except Exception as e:
-                    log(f"    ERROR: {e}")
-
-                # Rate limit between profiles
-                delay = random.uniform(3, 8)
-                await asyncio.sleep(delay)
-
-            # ── Phase 2: Discover new handles via hashtags ──
-            if len(queue) < 20:
-                tag = random.choice(DISCOVERY_HASHTAGS)
-                log(f"\n  Exploring hashtag #{tag}...")
-                new_handles = await discover_from_hashtag(page, tag)
-                new_handles = [h for h in new_handles if h not in visited and h not in queue]
-                queue.extend(new_handles[:30])
-                log(f"    Found {len(new_handles)} new handles from #{tag}")
-                state["total_discovered"] += len(new_handles)
-                await asyncio.sleep(random.uniform(3, 6))
-
-            # ── Phase 3: Discover via search ──
-            if len(queue) < 10:
-                query = random.choice(DISCOVERY_SEARCHES)
-                log(f"\n  Searching: '{query}'...")
-                new_handles = await discover_from_search(page, query)
-                new_handles = [h for h in new_handles if h not in visited and h not in queue]
-                queue.extend(new_handles[:30])
-                log(f"    Found {len(new_handles)} new handles from search")
-                state["total_discovered"] += len(new_handles)
-                await asyncio.sleep(random.uniform(3, 6))
-
-            # ── Save state ──
-            state["visited"] = list(visited)[-500:]  # Keep last 500 to cap file size
-            state["queue"] = queue[:200]  # Cap queue
-            save_state(state)
-            log(f"\n  State saved. Queue: {len(queue)}, Visited: {len(visited)}, DB inserts: {state['total_inserted']}")
-
-            # ── Pause between cycles ──
-            pause = random.uniform(15, 30)
-            log(f"  Pausing {pause:.0f}s before next cycle...")
-            await asyncio.sleep(pause)
+        # Stop cleanly on Ctrl-C / SIGTERM so buffered inserts are flushed
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:
+                pass
+
+        pacers = make_pacers(per_minute)
+        explore_lock = asyncio.Lock()
+        def landed(record, handle, followers):
+            people.add(record)
+            frontier.record(handle, "inserted", followers)
+
+        writer = InsertBuffer(on_written=landed)
+        flusher = asyncio.create_task(writer.run())
+        tasks = [asyncio.create_task(report(frontier)), asyncio.create_task(identity_sync(people)),
+                 flusher, asyncio.create_task(snapshot_metrics(frontier))]
+        if metrics_port:
+            tasks.append(asyncio.create_task(serve_metrics(metrics_port)))
+        tasks += [
+            asyncio.create_task(worker(n + 1, browser, frontier, people, writer, pacers, explore_lock))
+            for n in range(workers)
+        ]
+        stopper = asyncio.create_task(stop.wait())
+        try:
+            done, _ = await asyncio.wait(tasks + [stopper], return_when=asyncio.FIRST_COMPLETED)
+            if stop.is_set():
+                log("\nStopping — flushing buffered inserts...")
+            for t in done:
+                if t is not stopper and t.exception():
+                    raise t.exception()
+        finally:
+            # Let the flusher finish its current batch rather than cancel it mid-POST
+            writer.stop()
+            for t in tasks + [stopper]:
+                if t is not flusher:
+                    t.cancel()
+            await asyncio.gather(*tasks, stopper, return_exceptions=True)
+            await writer.close()
+            write_metrics_snapshot(frontier)
+            frontier.close()
+            people.close()
 
 
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="TikTok brainrot discovery scraper")
+    ap.add_argument("--workers", type=int, default=WORKERS,
+                    help=f"parallel browser contexts (default {WORKERS})")
+    ap.add_argument("--rate", type=float, default=VISITS_PER_MINUTE,
+                    help=f"max profile visits per minute across all workers (default {VISITS_PER_MINUTE})")
+    ap.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                    help=f"Prometheus /metrics port on 127.0.0.1, 0 to disable (default {METRICS_PORT})")
+    ap.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                    help="minimum level for console and scraper.jsonl (default INFO)")
+    ap.add_argument("--replay-dead-letters", action="store_true",
+                    help=f"re-send rows from {os.path.basename(DEAD_LETTER_FILE)} and exit")
+    args = ap.parse_args()
+    setup_logging(args.log_level)
     try:
-        asyncio.run(main())
+        if args.replay_dead_letters:
+            asyncio.run(replay_dead_letters())
+        else:
+            asyncio.run(main(args.workers, args.rate, args.metrics_port))
     except KeyboardInterrupt:
         log("\nScraper stopped by user.")
     except Exception as e:
-        log(f"\nFATAL: {e}")
+        log(f"\nFATAL: {e}", logging.CRITICAL)
         sys.exit(1)